@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+
+# Benchmarks for the construction, mutation, lookup and execution paths
+# of python-inquirer-executor.
+#
+# Every benchmark is run for a number of option counts. The user's
+# answers are fed in as simulated key presses, so the prompts are
+# rendered exactly as they would be in a terminal (with the output
+# being discarded).
+#
+# Usage:
+#   python3 benchmarks/benchmark.py --output results.json
+#   python3 benchmarks/benchmark.py --sizes 10 1000 --repeat 3
+#
+# The results are written as JSON, so the results of different
+# releases can be compared.
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from time import perf_counter
+from unittest.mock import patch
+
+from readchar import key
+from inquirer import Text
+
+sys.path.append(os.path.realpath("."))
+import inquirer_executor
+from inquirer_executor import (
+    InquirerExecutorList as InqExList,
+    InquirerExecutorCheckbox as InqExCheckbox,
+    QuestionsCatalogue,
+    AnsiBackend,
+    depends_on,
+    set_backend,
+)
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+
+def make_functions(size):
+    def make_function(number):
+        def return_number():
+            return number
+
+        return_number.__doc__ = "Return {}".format(number)
+        return_number.__name__ = "return_{}".format(number)
+        return return_number
+
+    return [make_function(number) for number in range(size)]
+
+
+def prompting(prompt, keys):
+    """
+    Returns a function calling prompt, which reads the given key
+    presses instead of reading from the terminal and discards
+    everything that is rendered.
+    """
+
+    def run():
+        key_presses = iter(keys)
+        with patch("readchar.readkey", lambda: next(key_presses)):
+            with redirect_stdout(io.StringIO()):
+                prompt()
+
+    return run
+
+
+# Every benchmark takes the number of options and returns a tuple of
+# the function to time (which is called without arguments) and the
+# number of operations it performs, so the time per operation can be
+# reported as well.
+
+
+def import_package(size):
+    # Starts a fresh interpreter every time, so the package isn't
+    # imported already. The number of options doesn't matter here.
+    command = [sys.executable, "-c", "import inquirer_executor"]
+    directory = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    return lambda: subprocess.run(command, cwd=directory, check=True), 1
+
+
+def construct_list(size):
+    functions = make_functions(size)
+    return lambda: InqExList("Which one?", functions), 1
+
+
+def construct_checkbox(size):
+    functions = make_functions(size)
+    return lambda: InqExCheckbox("Which ones?", functions), 1
+
+
+def add(size):
+    functions = make_functions(size)
+
+    def run():
+        inqex = InqExList("Which one?", [])
+        for function in functions:
+            inqex += function
+
+    return run, size
+
+
+def insert(size):
+    functions = make_functions(size)
+    count = min(size, 1000)
+
+    def run():
+        inqex = InqExList("Which one?", list(functions))
+        for function in functions[:count]:
+            inqex.insert(0, function)
+
+    return run, count
+
+
+def remove(size):
+    functions = make_functions(size)
+    count = min(size, 100)
+
+    def run():
+        inqex = InqExList("Which one?", list(functions))
+        # The functions have distinct names, so every call removes
+        # a single option
+        for function in functions[:count]:
+            inqex.remove(function.__name__)
+
+    return run, count
+
+
+def remove_many(size):
+    functions = make_functions(size)
+    count = min(size, 100)
+
+    def run():
+        inqex = InqExList("Which one?", list(functions))
+        inqex.remove_many(range(count))
+
+    return run, count
+
+
+def reorder(size):
+    inqex = InqExList("Which one?", make_functions(size))
+    indices = list(reversed(range(size)))
+    return lambda: inqex.reorder(indices), 1
+
+
+def find_function(size):
+    inqex = InqExList("Which one?", make_functions(size))
+    answers = [
+        "Return {}".format(number) for number in range(0, size, max(size // 10, 1))
+    ]
+
+    def run():
+        for answer in answers:
+            inqex.answer = answer
+            inqex.find_function()
+        # Mutating in between, so rebuilding the index is part of it
+        inqex.reverse()
+
+    return run, len(answers)
+
+
+def find_functions(size):
+    inqex = InqExCheckbox("Which ones?", make_functions(size))
+    inqex.answer = ["Return {}".format(number) for number in range(size)]
+    return inqex.find_functions, 1
+
+
+def execute_list(size):
+    inqex = InqExList("Which one?", make_functions(size))
+    inqex.answer = "Return {}".format(size - 1)
+    return inqex.execute, 1
+
+
+def execute_checkbox(size):
+    inqex = InqExCheckbox("Which ones?", make_functions(size))
+    inqex.answer = ["Return {}".format(number) for number in range(size)]
+    inqex.find_functions()
+    return inqex.execute, size
+
+
+def prompt_and_execute_list(size):
+    inqex = InqExList("Which one?", make_functions(size))
+    keys = [key.DOWN] * min(size - 1, 5) + [key.ENTER]
+    return prompting(inqex.prompt_and_execute, keys), 1
+
+
+def prompt_and_execute_checkbox(size):
+    inqex = InqExCheckbox("Which ones?", make_functions(size))
+    keys = [key.SPACE, key.DOWN] * min(size, 5) + [key.ENTER]
+    return prompting(inqex.prompt_and_execute, keys), 1
+
+
+def with_ansi_backend(run):
+    def run_with_ansi_backend():
+        previous = set_backend(AnsiBackend())
+        try:
+            run()
+        finally:
+            set_backend(previous)
+
+    return run_with_ansi_backend
+
+
+def prompt_and_execute_list_ansi(size):
+    inqex = InqExList("Which one?", make_functions(size))
+    keys = [key.DOWN] * min(size - 1, 5) + [key.ENTER]
+    return with_ansi_backend(prompting(inqex.prompt_and_execute, keys)), 1
+
+
+def prompt_and_execute_checkbox_ansi(size):
+    inqex = InqExCheckbox("Which ones?", make_functions(size))
+    keys = [key.SPACE, key.DOWN] * min(size, 5) + [key.ENTER]
+    return with_ansi_backend(prompting(inqex.prompt_and_execute, keys)), 1
+
+
+def prompt_all(size):
+    def run():
+        questions_catalogue = QuestionsCatalogue(
+            [
+                Text("name", message="What's your name"),
+                InqExCheckbox("Which ones?", make_functions(size)),
+                Text("email", message="What's your email"),
+                InqExList("Which one?", make_functions(size)),
+            ]
+        )
+        keys = (
+            ["a", key.ENTER]
+            + [key.SPACE, key.ENTER]
+            + ["b", key.ENTER]
+            + [key.DOWN, key.ENTER]
+        )
+        prompting(questions_catalogue.prompt_all, keys)()
+
+    return run, 1
+
+
+def execute_catalogue(size):
+    # Chains of ten functions, each depending on the previous one,
+    # so scheduling is what's being measured
+    functions = make_functions(size)
+    for number in range(1, size):
+        if number % 10:
+            depends_on(functions[number - 1])(functions[number])
+    questions_catalogue = QuestionsCatalogue([], executor="thread")
+    questions_catalogue.execution_stack = functions
+    return questions_catalogue.execute, size
+
+
+BENCHMARKS = [
+    import_package,
+    construct_list,
+    construct_checkbox,
+    add,
+    insert,
+    remove,
+    remove_many,
+    reorder,
+    find_function,
+    find_functions,
+    execute_list,
+    execute_checkbox,
+    prompt_and_execute_list,
+    prompt_and_execute_checkbox,
+    prompt_and_execute_list_ansi,
+    prompt_and_execute_checkbox_ansi,
+    prompt_all,
+    execute_catalogue,
+]
+
+
+def measure(benchmark, size, repeat):
+    run, operations = benchmark(size)
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        run()
+        timings.append(perf_counter() - started)
+    return dict(
+        benchmark=benchmark.__name__,
+        size=size,
+        operations=operations,
+        repeat=repeat,
+        best=min(timings),
+        mean=sum(timings) / len(timings),
+        best_per_operation=min(timings) / operations,
+    )
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmarks for python-inquirer-executor."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="numbers of options"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="how often each benchmark is run"
+    )
+    parser.add_argument(
+        "--only", nargs="+", help="names of the benchmarks to run (default: all)"
+    )
+    parser.add_argument("--output", help="path of the JSON file to write to")
+    arguments = parser.parse_args(arguments)
+
+    results = []
+    for benchmark in BENCHMARKS:
+        if arguments.only and benchmark.__name__ not in arguments.only:
+            continue
+        for size in arguments.sizes:
+            result = measure(benchmark, size, arguments.repeat)
+            results.append(result)
+            print(
+                "{benchmark:<30} {size:>7} options: {best:.6f}s "
+                "({best_per_operation:.9f}s per operation)".format(**result)
+            )
+
+    report = dict(
+        version=inquirer_executor.__version__,
+        python=platform.python_version(),
+        platform=platform.platform(),
+        created=datetime.now(timezone.utc).isoformat(),
+        results=results,
+    )
+    if arguments.output:
+        with open(arguments.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -42,6 +42,7 @@ from inquirer import Text, prompt
 sys.path.append(os.path.realpath("."))
 from inquirer_executor import (
     InquirerExecutorList as InqExList,
+    InquirerExecutorPagedList as InqExPagedList,
     InquirerExecutorCheckbox as InqExCheckbox,
     QuestionsCatalogue,
     dynamic_docstring_decorator,
@@ -132,8 +133,11 @@ class Entry:
     # considering the hassle it saves you.)
 
     def prepare(self):
-        # In here, the decorator is in scope to use `self.first_name` and `self.last_name`
-        @dynamic_docstring_decorator("{} {}".format(self.first_name, self.last_name))
+        # In here, the decorator is in scope to use `self.first_name` and `self.last_name`.
+        # Passing them as arguments (instead of formatting the docstring right away)
+        # defers formatting it until the option is actually displayed, so loading lots
+        # of contacts stays cheap.
+        @dynamic_docstring_decorator("{} {}", self.first_name, self.last_name)
         def show_options():
             options = InqExList(
                 "What do you want to do with {} {}?".format(
@@ -153,9 +157,7 @@ class Entry:
         self.show_options = show_options
 
         # Another method that needs a dynamically generated docstring
-        @dynamic_docstring_decorator(
-            "Delete {} {}".format(self.first_name, self.last_name)
-        )
+        @dynamic_docstring_decorator("Delete {} {}", self.first_name, self.last_name)
         def delete_entry():
             global entries
             entries = [entry for entry in entries if entry.last_name != self.last_name]
@@ -228,15 +230,19 @@ favourites = []
 # we have determined at the very top.
 
 # This is one of the functions with a dynamically generated
-# docstring, which is why we can handily and aptly generate all
-# options with a list comprehension. Pretty neat.
+# docstring. Since a contact book can grow quite large, the
+# contacts are shown one page at a time, and the `factory`
+# only picks the option for the contacts that are on the page
+# the user is looking at. Pretty neat.
 def list_all_contacts():
     """List all the contacts"""
     if not entries:
         print("Your cantact book is empty.")
     else:
-        InqExList(
-            "Here are all your contacts", [entry.show_options for entry in entries]
+        InqExPagedList(
+            "Here are all your contacts",
+            entries,
+            factory=lambda entry: entry.show_options,
         ).prompt_and_execute()
 
 
@@ -199,7 +199,9 @@ def flee(monster):
 
 # Combat loop will break if player flees or monster dies
 while True:
-    choice = InqExList("What do you do?", [attack, flee]).prompt_and_execute(monster1)
+    choice = InqExList.cached("What do you do?", [attack, flee]).prompt_and_execute(
+        monster1
+    )
     if not choice:
         break
 
@@ -213,7 +215,7 @@ def inside_castle():
     print("Inside the castle you find a treasure, but it's guarded by an armored bear.")
     # We use the same combat loop and the same functions as before.
     while True:
-        choice = InqExList("What do you do?", [attack, flee]).prompt_and_execute(
+        choice = InqExList.cached("What do you do?", [attack, flee]).prompt_and_execute(
             monster2
         )
         if not choice:
@@ -1,9 +1,34 @@
 from .inquirer_executor import (
     InquirerExecutorBase,
     InquirerExecutorList,
+    InquirerExecutorPagedList,
     InquirerExecutorCheckbox,
     QuestionsCatalogue,
+    MenuRegistry,
+    ExecutionError,
+    TimedOut,
+    AnswerProvider,
+    PromptBackend,
+    InquirerBackend,
+    AnsiBackend,
+    HeadlessBackend,
+    FakeBackend,
+    set_backend,
+    SessionRecorder,
+    SessionReplayer,
+    Event,
+    add_observer,
+    remove_observer,
+    LatencyHistogram,
+    JsonlEventWriter,
     dynamic_docstring_decorator,
+    option_timeout,
+    option_cache,
+    side_effect_free,
+    depends_on,
+    uses_resources,
+    invalidates,
+    invalidate,
 )
 
 #   _                _                                     _
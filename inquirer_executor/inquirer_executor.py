@@ -1,52 +1,382 @@
 # -*- coding: utf-8 -*-
 
-from functools import wraps
-from inspect import getfullargspec
-from inquirer import List, Checkbox, prompt, Path, Editor, Text
+import json
+import sys
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import OrderedDict, namedtuple
+from collections.abc import Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial, update_wrapper, wraps
+from heapq import heappop, heappush
+from itertools import islice
+from inspect import isawaitable, ismethod, signature, unwrap
+from os import PathLike, fspath
+from threading import Lock, Thread
+from time import monotonic, time
+from types import FunctionType, MethodType
+from weakref import WeakValueDictionary
 
 
-class InquirerExecutorBase:
-    def __init__(self, message, functions, carousel=False, inquirerInstance=None):
+# inquirer (along with the terminal libraries it depends on), asyncio
+# and concurrent.futures take a while to import, so they are only
+# imported once they are needed. Nothing is imported from inquirer
+# until the first question is prompted.
+def _inquirer():
+    import inquirer
+
+    return inquirer
+
+
+def prompt(questions, **kwargs):
+    return _inquirer().prompt(questions, **kwargs)
+
+
+class _Observable:
+    __slots__ = ()
+
+    # The observers are kept in a tuple, so instances without any
+    # don't carry an empty list around
+    def add_observer(self, observer):
+        """
+        Registers an observer, a callable that is called with
+        every Event fired by this instance.
+        Returns the instance itself.
+        """
+        self._observers += (observer,)
+        return self
+
+    def remove_observer(self, observer):
+        """
+        Unregisters an observer registered with add_observer().
+        Returns the instance itself.
+        """
+        observers = list(self._observers)
+        observers.remove(observer)
+        self._observers = tuple(observers)
+        return self
+
+
+class _Executing(_Observable):
+    """
+    Executes the chosen functions, taking their timeouts (see
+    option_timeout) and cached results (see option_cache) into
+    account.
+    """
+
+    __slots__ = ()
+
+    def _timeout_for(self, function, timeout=None):
+        # The timeout passed to the call beats the one of the option
+        # (see option_timeout), which beats the one of the instance
+        if timeout is None:
+            timeout = getattr(function, "_option_timeout", None)
+        if timeout is None:
+            timeout = self.timeout
+        return timeout
+
+    def _cached(self, function, args, kwargs):
+        # Returns the cache of the function (see option_cache), the key
+        # its result is cached under and the cached result, if any
+        cache = getattr(function, "_result_cache", None)
+        if cache is None:
+            return None, None, _missing
+        key, result = cache.lookup(function, args, kwargs)
+        if result is not _missing:
+            self._emit("cache_hit", function)
+        return cache, key, result
+
+    def _call(self, function, args, kwargs, timeout=None):
+        cache, key, result = self._cached(function, args, kwargs)
+        if result is not _missing:
+            return result
+        timeout = self._timeout_for(function, timeout)
+        try:
+            if timeout is None:
+                result = self._call_directly(function, args, kwargs)
+            else:
+                result = self._call_in_thread(function, args, kwargs, timeout)
+        finally:
+            invalidate(*getattr(function, "_invalidates", ()))
+        if cache is not None:
+            cache.store(key, result)
+        return result
+
+    def _call_in_thread(self, function, args, kwargs, timeout):
+        # Threads can't be stopped, so a function that doesn't finish
+        # in time keeps running in a daemon thread, which at least
+        # doesn't keep the interpreter from exiting
+        outcome = []
+
+        def run():
+            try:
+                outcome.append((self._call_directly(function, args, kwargs), None))
+            except BaseException as exception:
+                outcome.append((None, exception))
+
+        thread = Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if not outcome:
+            return TimedOut(function, timeout)
+        result, exception = outcome[0]
+        if exception is not None:
+            raise exception
+        return result
+
+    def _call_directly(self, function, args, kwargs):
+        self._emit("execution_start", function)
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as exception:
+            self._emit("execution_end", function, exception)
+            raise
+        self._emit("execution_end", function)
+        return result
+
+    def _create_pool(self):
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        if self.executor == "thread":
+            return ThreadPoolExecutor(max_workers=self.max_workers)
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def _finish_execution(self, function, cache, key, started, future):
+        if future.cancelled() and not started:
+            # Cancelled before a worker got to it, so it never started
+            return
+        exception = None if future.cancelled() else future.exception()
+        self._emit("execution_end", function, exception)
+        invalidate(*getattr(function, "_invalidates", ()))
+        if cache is not None and not future.cancelled() and exception is None:
+            cache.store(key, future.result())
+
+    def _submit_one(self, pool, function, args, kwargs, timeout):
+        # Returns the future of the function, the _Deadline it has to
+        # finish by and its timeout (if any)
+        from concurrent.futures import Future, ProcessPoolExecutor
+
+        seconds = self._timeout_for(function, timeout)
+        cache, key, result = self._cached(function, args, kwargs)
+        if result is not _missing:
+            future = Future()
+            future.set_result(result)
+            return future, None, seconds
+        deadline = None if seconds is None else _Deadline(seconds)
+        if isinstance(pool, ProcessPoolExecutor):
+            # Other processes can't reach the observers (or the
+            # deadline), so the submission is taken as the start instead
+            self._emit("execution_start", function)
+            if deadline is not None:
+                deadline.start()
+            future = pool.submit(function, *args, **kwargs)
+            started = True
+        else:
+            future = pool.submit(self._run_in_worker, function, args, kwargs, deadline)
+            started = False
+        future.add_done_callback(
+            partial(self._finish_execution, function, cache, key, started)
+        )
+        return future, deadline, seconds
+
+    def _run_in_worker(self, function, args, kwargs, deadline):
+        # The start is emitted (and the deadline started) by the worker,
+        # so the time spent waiting for one isn't counted as time spent
+        # executing the function
+        if deadline is not None:
+            deadline.start()
+        self._emit("execution_start", function)
+        return function(*args, **kwargs)
+
+
+class InquirerExecutorBase(_Executing):
+    __slots__ = (
+        "_observers",
+        "message",
+        "carousel",
+        "_question_type",
+        "_options",
+        "_cached_question",
+        "_cached_table",
+        "_options_argspecs",
+        "_pending_checks",
+        "answer",
+        "timeout",
+        "__weakref__",
+    )
+
+    def __init__(
+        self, message, functions, carousel=False, inquirerInstance=None, timeout=None
+    ):
         if not inquirerInstance:
             raise ValueError(
                 "You are not meant to use the base class directly, please use InquirerExecutorList or InquirerExecutorCheckbox instead."
             )
+        self._observers = ()
         self.message = message
         self.carousel = carousel
-        self._inquirerInstance = inquirerInstance
+        # The name of the inquirer question class
+        self._question_type = inquirerInstance
         self._options = functions
         self._update_question()
         self._options_argspecs = None
+        self._pending_checks = None
         self.answer = None
+        self.timeout = timeout
         for function in self._options:
             self._check_arg_consistency(function)
 
     def _update_question(self):
-        kwargs = dict(
-            message=self.message,
-            choices=[function.__doc__ for function in self._options],
-        )
-        if self.carousel:
-            kwargs.update(carousel=self.carousel)
-        self._question = [self._inquirerInstance("omittet", **kwargs)]
+        # Only marks the question and the choice table as outdated,
+        # both are rebuilt the next time they are needed, so mutating
+        # the options repeatedly doesn't rebuild them over and over.
+        self._cached_question = None
+        self._cached_table = None
+
+    @property
+    def _inquirerInstance(self):
+        question_type = self._question_type
+        if isinstance(question_type, str):
+            question_type = getattr(_inquirer(), question_type)
+        return question_type
+
+    @property
+    def _question(self):
+        if self._cached_question is None:
+            kwargs = dict(message=self.message, choices=self._choices())
+            if self.carousel:
+                kwargs.update(carousel=self.carousel)
+            self._cached_question = [self._inquirerInstance("omittet", **kwargs)]
+            self._emit("question_build")
+        return self._cached_question
+
+    @property
+    def _table(self):
+        if self._cached_table is None:
+            self._cached_table = _ChoiceTable.shared(self._options)
+        return self._cached_table
+
+    def _choices(self):
+        return self._table.labels
+
+    def _emit(self, kind, option=None, exception=None):
+        scoped_observers = _scoped_observers.get()
+        if _observers or scoped_observers or self._observers:
+            if isinstance(option, list):
+                # Observers get a snapshot of lists that may change later
+                option = list(option)
+            _fire(
+                _observers + list(scoped_observers) + list(self._observers),
+                Event(kind, monotonic(), self, option, exception),
+            )
+
+    async def _call_async(self, function, args, kwargs, timeout=None):
+        # Calls synchronous and coroutine functions alike, timeouts
+        # only apply to the latter
+        import asyncio
+
+        cache, key, result = self._cached(function, args, kwargs)
+        if result is not _missing:
+            return result
+        timeout = self._timeout_for(function, timeout)
+        self._emit("execution_start", function)
+        try:
+            result = function(*args, **kwargs)
+            if isawaitable(result):
+                if timeout is None:
+                    result = await result
+                else:
+                    try:
+                        result = await asyncio.wait_for(result, timeout)
+                    except asyncio.TimeoutError:
+                        result = TimedOut(function, timeout)
+        except BaseException as exception:
+            self._emit("execution_end", function, exception)
+            raise
+        finally:
+            invalidate(*getattr(function, "_invalidates", ()))
+        self._emit("execution_end", function)
+        if cache is not None:
+            cache.store(key, result)
+        return result
+
+    @property
+    def _index(self):
+        return self._table.index
 
     # In the interest of failing fast, checking for consistent args and kwargs at creation time
     def _check_arg_consistency(self, func):
-        argspec = getfullargspec(func).args
-        if self._options_argspecs or isinstance(self._options_argspecs, list):
-            if not self._options_argspecs == argspec:
-                raise AssertionError(
-                    """
-                All functions passed to an InquirerExecutor instance need to accept the same arguments and keywords.
-                See README under "Passing arguments and keyword arguments" for more information.
+        if self._pending_checks is not None:
+            self._pending_checks.append(func)
+            return
+        fingerprint = _signature_fingerprint(func)
+        if self._options_argspecs is None:
+            self._options_argspecs = fingerprint
+        elif not self._options_argspecs == fingerprint:
+            raise AssertionError(
                 """
-                )
-        else:
-            self._options_argspecs = argspec
+            All functions passed to an InquirerExecutor instance need to accept the same arguments and keywords.
+            See README under "Passing arguments and keyword arguments" for more information.
+            """
+            )
+
+    @classmethod
+    def from_iterable(cls, message, functions, carousel=False, **kwargs):
+        return cls(message, functions, carousel, **kwargs)
 
     @classmethod
-    def from_iterable(cls, message, functions, carousel=False):
-        return cls(message, functions, carousel)
+    def cached(cls, message, functions, carousel=False, registry=None, **kwargs):
+        """
+        Works like instantiating the class, but returns the same
+        instance whenever it is called with the same message,
+        functions and further arguments again (with its answer
+        reset), so menus prompted in a loop are only created once.
+        The instances are kept in the given MenuRegistry, or a
+        shared default one. Cached instances must not be mutated.
+        """
+        if registry is None:
+            registry = _menu_registry
+        return registry.get(cls, message, functions, carousel=carousel, **kwargs)
+
+    def _reset(self):
+        self.answer = None
+
+    def _highlighted(self, label):
+        # Called by backends that know which option the user has
+        # highlighted (see InquirerExecutorList)
+        pass
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager that defers checking the parameter
+        consistency of added functions until the block exits,
+        so many mutations can be applied at once.
+        If the block raises or the check fails, the options
+        are restored to what they were before entering it.
+        """
+        if self._pending_checks is not None:
+            # Nested batches are validated by the outermost one
+            yield self
+            return
+        options = list(self._options)
+        argspecs = self._options_argspecs
+        self._pending_checks = []
+        try:
+            yield self
+            pending, self._pending_checks = self._pending_checks, None
+            # Functions that got removed again inside the block don't matter
+            current = {id(option) for option in self._options}
+            for function in pending:
+                if id(function) in current:
+                    self._check_arg_consistency(function)
+        except BaseException:
+            self._pending_checks = None
+            self._options[:] = options
+            self._options_argspecs = argspecs
+            self._update_question()
+            raise
 
     def __iter__(self):
         yield from self._options
@@ -59,13 +389,52 @@ class InquirerExecutorBase:
         """
         # If an iterable has already been provided, use it, if not, create one with single item
         options = options if hasattr(options, "__iter__") else [options]
-        for item in options:
-            if not callable(item):
+        return self.extend(options)
+
+    def _check_functions(self, functions):
+        # Checks the parameters of every distinct code object only once
+        checked = set()
+        for function in functions:
+            if not callable(function):
                 raise TypeError(
                     "Only function types (or iterables of them) can be added to an InquirerExecutor instance."
                 )
-            self._check_arg_consistency(item)
-        self._options.extend(options)
+            key = _signature_key(function)
+            # Inside a batch, every function is checked when it exits
+            if key[0] is not None and self._pending_checks is None:
+                if key in checked:
+                    continue
+                checked.add(key)
+            self._check_arg_consistency(function)
+
+    def extend(self, functions):
+        """
+        Adds all functions of an iterable to the list of options
+        at once. Checks for the right types and parameter
+        consistency before adding any of them.
+        """
+        functions = list(functions)
+        self._check_functions(functions)
+        self._options.extend(functions)
+        self._update_question()
+        return self
+
+    def replace_all(self, functions):
+        """
+        Replaces all options with the functions of an iterable.
+        Checks for the right types and parameter consistency
+        before replacing any of them.
+        """
+        functions = list(functions)
+        argspecs = self._options_argspecs
+        # The parameters of the replaced options don't matter anymore
+        self._options_argspecs = None
+        try:
+            self._check_functions(functions)
+        except BaseException:
+            self._options_argspecs = argspecs
+            raise
+        self._options = functions
         self._update_question()
         return self
 
@@ -88,8 +457,12 @@ class InquirerExecutorBase:
         Checks for the right types and parameter consistency
         at execution time.
         """
-        self._options.insert(index, value)
+        if not callable(value):
+            raise TypeError(
+                "Only function types (or methods) can be part of an InquirerExecutor instance."
+            )
         self._check_arg_consistency(value)
+        self._options.insert(index, value)
         self._update_question()
         return self
 
@@ -98,7 +471,22 @@ class InquirerExecutorBase:
         Reorders the options according to the indices parameter,
         which is a list of numbers, defining the new indices of
         the corresponting options.
+        Every index of the options needs to be contained exactly
+        once, otherwise a ValueError is raised.
         """
+        indices = list(indices)
+        count = len(self._options)
+        if len(indices) != count:
+            raise ValueError(
+                "Reordering needs exactly one index per option ({}).".format(count)
+            )
+        seen = bytearray(count)
+        for index in indices:
+            if not isinstance(index, int) or not -count <= index < count:
+                raise ValueError("{!r} is not an index of the options.".format(index))
+            if seen[index]:
+                raise ValueError("The index {!r} is contained twice.".format(index))
+            seen[index] = 1
         self._options = [self._options[i] for i in indices]
         self._update_question()
         return self
@@ -132,45 +520,162 @@ class InquirerExecutorBase:
         else:
             raise ValueError("You can only remove functions by index or function name.")
 
-    def prompt_user(self, **kwargs):
+    def remove_many(self, function_names_indices_or_predicate):
+        """
+        Removes several options at once, either all options for
+        which the passed in predicate returns True, or all options
+        whose function names or indices are contained in the passed
+        in iterable (which may mix both).
+        """
+        if callable(function_names_indices_or_predicate):
+            predicate = function_names_indices_or_predicate
+            self._options = [
+                option for option in self._options if not predicate(option)
+            ]
+            self._update_question()
+            return self
+        values = function_names_indices_or_predicate
+        if isinstance(values, (str, int)):
+            values = [values]
+        names = set()
+        indices = set()
+        count = len(self._options)
+        for value in values:
+            if isinstance(value, str):
+                names.add(value)
+            elif isinstance(value, int):
+                if not -count <= value < count:
+                    raise IndexError(
+                        "{!r} is not an index of the options.".format(value)
+                    )
+                indices.add(value % count)
+            else:
+                raise ValueError(
+                    "You can only remove functions by index or function name."
+                )
+        self._options = [
+            option
+            for index, option in enumerate(self._options)
+            if index not in indices and getattr(option, "__name__", None) not in names
+        ]
+        self._update_question()
+        return self
+
+    def prompt_user(self, answers=None, **kwargs):
         """
         Prompts the user and presents them with the available
         options. Sets the instances answer value and returns the
         instance itself.
+        The user is prompted by the backend set with set_backend().
+        If answers are passed (see AnswerProvider), the answer is
+        taken from them instead and the user is not prompted.
         """
-        self.answer = prompt(self._question, **kwargs)["omittet"]
+        if answers is None and _replayers:
+            answers = _replayers[-1]
+        backend = _backend if answers is None else HeadlessBackend(answers)
+        started = time()
+        self._emit("prompt_start")
+        try:
+            self.answer = backend.prompt(self, **kwargs)
+        except BaseException as exception:
+            self._emit("prompt_end", exception=exception)
+            raise
+        self._emit("prompt_end")
+        if _recorders:
+            chosen = self.answer if isinstance(self.answer, list) else [self.answer]
+            functions = [
+                self._index[answer] for answer in chosen if answer in self._index
+            ]
+            _record(self.message, self.answer, functions, started)
         return self
 
+    async def async_prompt_user(self, answers=None, **kwargs):
+        """
+        Does the same as prompt_user(), but waits for the user's
+        answer in a worker thread, so the event loop keeps running
+        while the user is being prompted.
+        """
+        if answers is not None:
+            return self.prompt_user(answers=answers)
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.prompt_user, **kwargs))
+
 
 class InquirerExecutorList(InquirerExecutorBase):
     """
     This class creates single-choice questions where the
     options are docstrings related to functions (or methods).
+    If it is filterable, the user can narrow the options down
+    with a search term (how depends on the backend).
+    If it is speculative, prompt_and_execute() starts executing
+    options marked as side_effect_free in the background while
+    the user is still choosing: the one chosen most often so far,
+    and the one the user highlights (if the backend tells).
     """
 
-    def __init__(self, message, functions, carousel=False):
-        super().__init__(message, functions, carousel=carousel, inquirerInstance=List)
+    __slots__ = ("filterable", "speculative", "_speculation", "_chosen_counts")
+
+    def __init__(
+        self,
+        message,
+        functions,
+        carousel=False,
+        filterable=False,
+        timeout=None,
+        speculative=False,
+    ):
+        super().__init__(
+            message,
+            functions,
+            carousel=carousel,
+            inquirerInstance="List",
+            timeout=timeout,
+        )
+        self.filterable = filterable
+        self.speculative = speculative
+        self._speculation = None
+        self._chosen_counts = None
+
+    def filter(self, search_term):
+        """
+        Returns the docstrings of all options that contain the
+        search term (ignoring case), in the order of the options.
+        """
+        return self._table.search_index.search(search_term)
+
+    def _check_answer(self, answer):
+        if answer not in self._index:
+            raise ValueError(
+                "{!r} is not one of the options of {!r}.".format(answer, self.message)
+            )
+        return answer
 
     def find_function(self):
         """
         Finds the function in the options that corresponds
         with the instances answer value.
         Then returns that function.
+        If several options share the same docstring, the
+        first one of them is returned.
         """
-        for function in self._options:
-            if function.__doc__ == self.answer:
-                return function
+        function = self._index.get(self.answer)
+        self._emit("answer_resolved", function)
+        return function
 
     def execute(self, *args, **kwargs):
         """
         Executes the function in the options that corresponds
         with the instances answer value with the passed in args
         and kwargs.
-        Returns the return value of the called function.
+        Returns the return value of the called function, or a
+        TimedOut instance if it didn't finish within its timeout.
         """
+        timeout = kwargs.pop("_timeout", None)
         if not self.answer:
             raise ValueError("Execution not possible since no answer was provided.")
-        return self.find_function()(*args, **kwargs)
+        return self._call(self.find_function(), args, kwargs, timeout)
 
     def prompt_and_execute(self, *args, **kwargs):
         """
@@ -179,48 +684,458 @@ class InquirerExecutorList(InquirerExecutorBase):
         Executes the function in the options that corresponds
         with the users answer with the passed in args
         and kwargs.
-        Returns the return value of the called function.
+        Returns the return value of the called function, or a
+        TimedOut instance if it didn't finish within its timeout.
+        """
+        theme = kwargs.pop("theme", None)
+        answers = kwargs.pop("_answers", None)
+        timeout = kwargs.pop("_timeout", None)
+        if not self.speculative or answers is not None:
+            self.prompt_user(theme=theme, answers=answers)
+            return self._call(self.find_function(), args, kwargs, timeout)
+        self._speculation = _Speculation(args, kwargs)
+        try:
+            self._speculate(self._most_often_chosen())
+            self.prompt_user(theme=theme, answers=answers)
+            if self._chosen_counts is None:
+                self._chosen_counts = {}
+            self._chosen_counts[self.answer] = (
+                self._chosen_counts.get(self.answer, 0) + 1
+            )
+            return self._call_speculated(self.find_function(), args, kwargs, timeout)
+        finally:
+            # Results of options that weren't chosen are thrown away
+            self._speculation.discard()
+            self._speculation = None
+
+    def _highlighted(self, label):
+        self._speculate(self._index.get(label))
+
+    def _speculate(self, function):
+        if (
+            self._speculation is None
+            or function is None
+            or not getattr(function, "_side_effect_free", False)
+        ):
+            return
+        cache = getattr(function, "_result_cache", None)
+        speculation = self._speculation
+        if (
+            cache is not None
+            and cache.lookup(function, speculation.args, speculation.kwargs)[1]
+            is not _missing
+        ):
+            # No need to, its result is cached already
+            return
+        speculation.start(function)
+
+    def _most_often_chosen(self):
+        if not self._chosen_counts:
+            return None
+        counts = [
+            (count, label)
+            for label, count in self._chosen_counts.items()
+            if getattr(self._index.get(label), "_side_effect_free", False)
+        ]
+        return self._index[max(counts)[1]] if counts else None
+
+    def _call_speculated(self, function, args, kwargs, timeout):
+        future = self._speculation.take(function)
+        if future is None:
+            return self._call(function, args, kwargs, timeout)
+        from concurrent.futures import wait
+
+        # The function is running (or even done) already, so only what's
+        # left of its execution is waited for
+        timeout = self._timeout_for(function, timeout)
+        self._emit("execution_start", function)
+        done, _ = wait([future], timeout)
+        if not done:
+            self._emit("execution_end", function)
+            return TimedOut(function, timeout)
+        exception = future.exception()
+        self._emit("execution_end", function, exception)
+        if exception is not None:
+            # Things might have changed since, so it gets another chance
+            return self._call(function, args, kwargs, timeout)
+        result = future.result()
+        cache = getattr(function, "_result_cache", None)
+        if cache is not None:
+            cache.store(cache.lookup(function, args, kwargs)[0], result)
+        return result
+
+    async def async_execute(self, *args, **kwargs):
+        """
+        Does the same as execute(), but awaits the return value
+        of the called function if it is awaitable, so coroutine
+        functions can be used as options.
+        """
+        timeout = kwargs.pop("_timeout", None)
+        if not self.answer:
+            raise ValueError("Execution not possible since no answer was provided.")
+        return await self._call_async(self.find_function(), args, kwargs, timeout)
+
+    async def async_prompt_and_execute(self, *args, **kwargs):
+        """
+        Does the same as prompt_and_execute(), but prompts the
+        user without blocking the event loop and awaits the
+        return value of the called function if it is awaitable.
         """
         theme = kwargs.pop("theme", None)
-        return self.prompt_user(theme=theme).find_function()(*args, **kwargs)
+        answers = kwargs.pop("_answers", None)
+        timeout = kwargs.pop("_timeout", None)
+        await self.async_prompt_user(theme=theme, answers=answers)
+        return await self._call_async(self.find_function(), args, kwargs, timeout)
+
+
+class InquirerExecutorPagedList(InquirerExecutorList):
+    """
+    This class creates single-choice questions for very large
+    numbers of options, which are presented to the user one
+    page at a time.
+    The source can either be a sequence (e.g. a list), of which
+    only the rows on the pages the user visits are read, or any
+    other iterable (e.g. a generator), which is consumed only as
+    far as the user pages through it.
+    If a factory is passed, it is called with every row to produce
+    the corresponding function, so functions and docstrings are
+    only produced for the rows that are actually displayed.
+    Indexing and iterating the instance refer to the options on
+    the current page, mutating its options is not supported.
+    Answers that aren't on the current page (see AnswerProvider)
+    are looked for on the pages read so far and on at most
+    search_pages pages beyond them.
+    """
+
+    __slots__ = ("page_size", "search_pages", "_factory", "_source", "_rows", "page")
+
+    previous_page_label = "<< Previous page"
+    next_page_label = "Next page >>"
+
+    def __init__(
+        self,
+        message,
+        source,
+        carousel=False,
+        page_size=20,
+        factory=None,
+        timeout=None,
+        search_pages=10,
+    ):
+        if page_size < 1:
+            raise ValueError("The page size needs to be at least 1.")
+        self.page_size = page_size
+        self.search_pages = search_pages
+        self._factory = factory
+        if isinstance(source, Sequence):
+            self._source = source
+            self._rows = None
+        else:
+            self._source = iter(source)
+            self._rows = []
+        super().__init__(message, [], carousel=carousel, timeout=timeout)
+        self.page = 0
+        self._load_page(0)
+
+    def _read_rows(self, start, stop):
+        if self._rows is None:
+            return self._source[start:stop]
+        # Consuming the iterator only as far as needed, rows already
+        # read are kept for navigating back to them
+        if len(self._rows) < stop:
+            self._rows.extend(islice(self._source, stop - len(self._rows)))
+        return self._rows[start:stop]
+
+    def _has_next_page(self):
+        stop = (self.page + 1) * self.page_size
+        return bool(self._read_rows(stop, stop + 1))
+
+    def _load_page(self, page):
+        start = page * self.page_size
+        rows = self._read_rows(start, start + self.page_size)
+        functions = [self._factory(row) for row in rows] if self._factory else rows
+        for function in functions:
+            if not callable(function):
+                raise TypeError(
+                    "Only function types (or methods) can be part of an InquirerExecutor instance."
+                )
+            self._check_arg_consistency(function)
+        self._options = list(functions)
+        self.page = page
+        self._update_question()
+
+    def _choices(self):
+        choices = list(super()._choices())
+        if self.page > 0:
+            choices.insert(0, self.previous_page_label)
+        if self._has_next_page():
+            choices.append(self.next_page_label)
+        return choices
+
+    def _check_answer(self, answer):
+        if answer in self._index:
+            return answer
+        if answer == self.previous_page_label and self.page > 0:
+            return answer
+        if answer == self.next_page_label and self._has_next_page():
+            return answer
+        # Looking for the answer on the other pages, from the first on,
+        # but only a few pages beyond the ones read already, so a
+        # mistyped answer doesn't read the whole source
+        current = self.page
+        if self._rows is None:
+            read = current + 1
+        else:
+            read = -(-len(self._rows) // self.page_size)
+        page = 0
+        while page < read + self.search_pages:
+            self._load_page(page)
+            if answer in self._index:
+                return answer
+            if not self._has_next_page():
+                break
+            page += 1
+        self._load_page(current)
+        raise ValueError(
+            "{!r} is not one of the options of {!r}.".format(answer, self.message)
+        )
+
+    def prompt_user(self, answers=None, **kwargs):
+        """
+        Prompts the user and presents them with the options on
+        the current page, as well as with options to navigate to
+        the previous and the next page, until the user has chosen
+        one of the options. Sets the instances answer value and
+        returns the instance itself.
+        """
+        # Wrapping the answers once, so every page continues where the
+        # last one stopped instead of starting over
+        if answers is not None:
+            answers = AnswerProvider.wrap(answers)
+        while True:
+            super().prompt_user(answers=answers, **kwargs)
+            if self.answer == self.previous_page_label:
+                self._load_page(self.page - 1)
+            elif self.answer == self.next_page_label:
+                self._load_page(self.page + 1)
+            else:
+                return self
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(
+            "The options of an InquirerExecutorPagedList are produced by its source and can't be changed."
+        )
+
+    __add__ = __setitem__ = insert = reorder = reverse = remove = _read_only
+    extend = replace_all = remove_many = _read_only
 
 
 class InquirerExecutorCheckbox(InquirerExecutorBase):
     """
     This class creates multiple-choice questions where the
     options are docstrings related to functions (or methods).
+    By default the selected functions are executed one after
+    another. Passing "thread", "process" or an instance of
+    concurrent.futures.Executor as executor runs them
+    concurrently instead.
     """
 
-    def __init__(self, message, functions, carousel=False):
+    __slots__ = ("executor", "max_workers", "execution_stack")
+
+    def __init__(
+        self,
+        message,
+        functions,
+        carousel=False,
+        executor=None,
+        max_workers=None,
+        timeout=None,
+    ):
+        if executor not in (None, "thread", "process") and not _is_executor(executor):
+            raise ValueError(
+                'The executor needs to be "thread", "process" or an instance of concurrent.futures.Executor.'
+            )
         super().__init__(
-            message, functions, carousel=carousel, inquirerInstance=Checkbox
+            message,
+            functions,
+            carousel=carousel,
+            inquirerInstance="Checkbox",
+            timeout=timeout,
         )
+        self.executor = executor
+        self.max_workers = max_workers
         self.execution_stack = []
 
+    def _reset(self):
+        super()._reset()
+        self.execution_stack = []
+
+    def _check_answer(self, answer):
+        if isinstance(answer, str):
+            raise ValueError(
+                "The answer to {!r} needs to be a list of options.".format(self.message)
+            )
+        answer = list(answer)
+        for option in answer:
+            if option not in self._index:
+                raise ValueError(
+                    "{!r} is not one of the options of {!r}.".format(
+                        option, self.message
+                    )
+                )
+        return answer
+
     def find_functions(self):
         """
         Finds the functions in the options that corresponds
         with the instances answer value.
         Then returns a list of matching functions.
         """
+        selected = set(self.answer)
         self.execution_stack = [
-            function for function in self._options if function.__doc__ in self.answer
+            function
+            for label, function in zip(self._table.labels, self._options)
+            if label in selected
         ]
+        self._emit("answer_resolved", self.execution_stack)
         return self.execution_stack
 
+    def _execute_stack(self, args, kwargs, timeout=None):
+        if self.executor is None:
+            return [
+                self._call(function, args, kwargs, timeout)
+                for function in self.execution_stack
+            ]
+        if _is_executor(self.executor):
+            return self._execute_stack_concurrently(
+                self.executor, args, kwargs, timeout
+            )
+        pool = self._create_pool()
+        try:
+            return self._execute_stack_concurrently(pool, args, kwargs, timeout)
+        finally:
+            # Not waiting for functions that timed out
+            pool.shutdown(wait=False)
+
+    def _submit(self, pool, args, kwargs, timeout):
+        # Returns a dict mapping the futures to their functions and the
+        # deadlines and timeouts they have to finish within (if any)
+        futures = {}
+        for function in self.execution_stack:
+            future, deadline, seconds = self._submit_one(
+                pool, function, args, kwargs, timeout
+            )
+            futures[future] = (function, deadline, seconds)
+        return futures
+
+    def _execute_stack_concurrently(self, pool, args, kwargs, timeout):
+        from concurrent.futures import wait
+
+        futures = self._submit(pool, args, kwargs, timeout)
+        # Waiting for every future, so one failing function doesn't
+        # keep the others from finishing
+        r = []
+        errors = []
+        try:
+            for future, (function, deadline, seconds) in futures.items():
+                if deadline is not None:
+                    while not future.done():
+                        wait([future], deadline.remaining())
+                        if deadline.expired(future):
+                            break
+                    if not future.done():
+                        future.cancel()
+                        r.append(TimedOut(function, seconds))
+                        continue
+                try:
+                    r.append(future.result())
+                except Exception as exception:
+                    r.append(None)
+                    errors.append((function, exception))
+        except BaseException:
+            # E.g. a KeyboardInterrupt, the functions that haven't been
+            # started yet are not started anymore
+            for future in futures:
+                future.cancel()
+            raise
+        if errors:
+            raise ExecutionError(r, errors)
+        return r
+
+    def _iter_execute_stack(self, args, kwargs, timeout=None):
+        if self.executor is None:
+            for function in list(self.execution_stack):
+                try:
+                    result = self._call(function, args, kwargs, timeout)
+                except Exception as exception:
+                    result = exception
+                yield function, result
+        elif _is_executor(self.executor):
+            yield from self._iter_execute_stack_concurrently(
+                self.executor, args, kwargs, timeout
+            )
+        else:
+            pool = self._create_pool()
+            try:
+                yield from self._iter_execute_stack_concurrently(
+                    pool, args, kwargs, timeout
+                )
+            finally:
+                pool.shutdown(wait=False)
+
+    def _iter_execute_stack_concurrently(self, pool, args, kwargs, timeout):
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        futures = self._submit(pool, args, kwargs, timeout)
+        try:
+            while futures:
+                done, _ = wait(futures, _remaining(futures.values()), FIRST_COMPLETED)
+                for future in done:
+                    # Not keeping the result around once it is handed out
+                    function, _, _ = futures.pop(future)
+                    exception = future.exception()
+                    yield function, future.result() if exception is None else exception
+                for future, (function, deadline, seconds) in list(futures.items()):
+                    if deadline is not None and deadline.expired(future):
+                        future.cancel()
+                        del futures[future]
+                        yield function, TimedOut(function, seconds)
+        finally:
+            # If the iteration is stopped early (or interrupted), the
+            # functions that haven't been started yet are not started
+            for future in futures:
+                future.cancel()
+
     def execute(self, *args, **kwargs):
         """
         Executes the functions in the options that corresponds
         with the instances execution_stack value with the passed in args
         and kwargs.
         Returns the a list of the called functions return values.
+        Functions that didn't finish within their timeout are
+        represented by a TimedOut instance.
+        When executing concurrently, an ExecutionError is raised
+        after all functions have finished if any of them failed.
         """
-        r = []
+        timeout = kwargs.pop("_timeout", None)
         if not self.execution_stack:
             raise ValueError("Execution not possible since no answer was provided.")
-        for function in self.execution_stack:
-            r.append(function(*args, **kwargs))
-        return r
+        return self._execute_stack(args, kwargs, timeout)
+
+    def iter_execute(self, *args, **kwargs):
+        """
+        Does the same as execute(), but returns an iterator that
+        yields a (function, result) tuple as soon as each of the
+        functions has finished, in the order they finish in.
+        If a function raised an exception, the exception is
+        yielded as its result instead of being raised.
+        When executing concurrently, closing the iterator early
+        keeps the functions that haven't started yet from running.
+        """
+        timeout = kwargs.pop("_timeout", None)
+        if not self.execution_stack:
+            raise ValueError("Execution not possible since no answer was provided.")
+        return self._iter_execute_stack(args, kwargs, timeout)
 
     def prompt_and_execute(self, *args, **kwargs):
         """
@@ -231,87 +1146,1566 @@ class InquirerExecutorCheckbox(InquirerExecutorBase):
         and kwargs.
         Returns the a list of the called functions return values.
         """
-        r = []
         theme = kwargs.pop("theme", None)
-        self.prompt_user(theme=theme).find_functions()
-        for function in self.execution_stack:
-            r.append(function(*args, **kwargs))
+        answers = kwargs.pop("_answers", None)
+        timeout = kwargs.pop("_timeout", None)
+        self.prompt_user(theme=theme, answers=answers).find_functions()
+        return self._execute_stack(args, kwargs, timeout)
+
+    async def _async_execute_stack(self, args, kwargs, timeout=None):
+        import asyncio
+
+        tasks = [
+            asyncio.ensure_future(self._call_async(function, args, kwargs, timeout))
+            for function in self.execution_stack
+        ]
+        if not tasks:
+            return []
+        try:
+            await asyncio.wait(tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+        r = []
+        errors = []
+        for function, task in zip(self.execution_stack, tasks):
+            if task.exception() is None:
+                r.append(task.result())
+            else:
+                r.append(None)
+                errors.append((function, task.exception()))
+        if errors:
+            raise ExecutionError(r, errors)
         return r
 
+    async def async_execute(self, *args, **kwargs):
+        """
+        Does the same as execute(), but awaits the return values
+        of the called functions that are awaitable concurrently.
+        If any of them failed, an ExecutionError is raised after
+        all of them have finished.
+        """
+        timeout = kwargs.pop("_timeout", None)
+        if not self.execution_stack:
+            raise ValueError("Execution not possible since no answer was provided.")
+        return await self._async_execute_stack(args, kwargs, timeout)
+
+    async def async_prompt_and_execute(self, *args, **kwargs):
+        """
+        Does the same as prompt_and_execute(), but prompts the
+        user without blocking the event loop and awaits the
+        return values of the called functions that are awaitable
+        concurrently.
+        """
+        theme = kwargs.pop("theme", None)
+        answers = kwargs.pop("_answers", None)
+        timeout = kwargs.pop("_timeout", None)
+        await self.async_prompt_user(theme=theme, answers=answers)
+        self.find_functions()
+        return await self._async_execute_stack(args, kwargs, timeout)
+
+
+def _is_executor(executor):
+    # Executors can't have been created without importing
+    # concurrent.futures, so there is no need to import it here
+    futures = sys.modules.get("concurrent.futures")
+    return futures is not None and isinstance(executor, futures.Executor)
+
 
-class QuestionsCatalogue(list):
+class MenuRegistry:
     """
-    This class inherits from list, so it can be used like a list,
-    the only two things is sets itself apart from the built-in list
-    is that fact that it type-checks it's members and offers the 
-    prompt_all() method. (Request help() for this method for more
-    information.)
-    All members of the list must either be instances of question
-    types offered by the inquirer package, or instances of 
-    InquirerExecutorCheckbox or InquirerExecutorList.
+    Keeps InquirerExecutor instances for reuse (see the cached()
+    class method), identified by their class, message, functions
+    and further arguments. Once more than maxsize instances are
+    kept, the least recently used ones are dropped.
     """
 
-    def __init__(self, list_of_questions):
-        if not isinstance(list_of_questions, (list, tuple, set, frozenset)):
-            raise TypeError("You need to instantiate this class with an iterable type.")
-        l = []
-        for question in list_of_questions:
-            l.append(self._check_item_type(question))
-        super().__init__(l)
-        self.execution_stack = []
-        self.answer_dict = {}
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._instances = OrderedDict()
+        self._lock = Lock()
 
-    @staticmethod
-    def _check_item_type(question):
-        if not isinstance(
-            question,
-            (
-                List,
-                Checkbox,
-                Path,
-                Editor,
-                Text,
-                InquirerExecutorCheckbox,
-                InquirerExecutorList,
-            ),
-        ):
-            raise TypeError(
-                "Every item in the iterable must be an instance of an Inquirer or InquirerExecutor class."
-            )
-        return question
+    def get(self, cls, message, functions, carousel=False, **kwargs):
+        """
+        Returns the kept instance of cls for the given arguments
+        with its answer reset, or creates and keeps a new one.
+        """
+        functions = tuple(functions)
+        key = (cls, message, functions, carousel, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            # Can't be identified, e.g. because of unhashable arguments
+            return cls(message, list(functions), carousel, **kwargs)
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is not None:
+                self._instances.move_to_end(key)
+                instance._reset()
+                return instance
+        instance = cls(message, list(functions), carousel, **kwargs)
+        with self._lock:
+            self._instances[key] = instance
+            while len(self._instances) > self.maxsize:
+                self._instances.popitem(last=False)
+        return instance
 
-    def prompt_all(self):
+    def clear(self):
         """
-        Prompts the user for all questions in the list.
-        The method returns a tuple made up of a dict of answers
-        to the questions that have been constructed using the "inquirer"-
-        package (of the kind the package would return itself) 
-        and a list of functions that have been selected by
-        the user during the course of answering all of the questions.
+        Drops all kept instances.
         """
-        for question in self:
-            if isinstance(question, InquirerExecutorList):
-                question.prompt_user()
-                self.execution_stack.append(question.find_function())
-            elif isinstance(question, InquirerExecutorCheckbox):
-                question.prompt_user()
-                self.execution_stack.extend(question.find_functions())
-            else:
-                self.answer_dict.update(prompt([question]))
-        return (self.answer_dict, self.execution_stack)
+        with self._lock:
+            self._instances.clear()
+
+    def __len__(self):
+        return len(self._instances)
+
 
+_menu_registry = MenuRegistry()
 
-def dynamic_docstring_decorator(docstring):
+
+class ExecutionError(Exception):
     """
-    A decorator that allows for dynamic creation of docstrings.
+    Raised when one or more of several concurrently executed
+    functions failed. The results attribute holds the return
+    values in the order of execution (None for failed functions),
+    the errors attribute a list of (function, exception) tuples.
+    The skipped attribute lists the functions that weren't executed
+    since a function they depend on failed (see depends_on).
     """
 
-    def dynamic_docstring_decorator_wrap(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            return func(*args, **kwargs)
+    def __init__(self, results, errors, skipped=()):
+        message = "{} of {} executed functions raised an exception.".format(
+            len(errors), len(results)
+        )
+        if skipped:
+            message += " Skipped {}, since a function they depend on didn't finish.".format(
+                len(skipped)
+            )
+        super().__init__(message)
+        self.results = results
+        self.errors = errors
+        self.skipped = list(skipped)
 
-        wrapper.__doc__ = docstring
-        return wrapper
 
-    return dynamic_docstring_decorator_wrap
+class TimedOut:
+    """
+    Takes the place of the return value of a function that didn't
+    finish within its timeout. Its function attribute holds the
+    function, its timeout attribute the timeout in seconds.
+    It is falsy, like a function that didn't return anything.
+    """
+
+    __slots__ = ("function", "timeout")
+
+    def __init__(self, function, timeout):
+        self.function = function
+        self.timeout = timeout
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return "<TimedOut {} after {}s>".format(
+            _qualified_name(self.function), self.timeout
+        )
+
+
+_missing = object()
+
+
+class _Deadline:
+    """
+    The time a function handed to an executor has to finish by, which
+    counts from the moment a worker starts executing it.
+    """
+
+    __slots__ = ("seconds", "started")
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.started = None
+
+    def start(self):
+        self.started = monotonic()
+
+    def remaining(self):
+        # Functions still waiting for a worker are checked on every so
+        # often, as nobody is notified when a worker starts them
+        if self.started is None:
+            return self.seconds
+        return max(self.started + self.seconds - monotonic(), 0)
+
+    def expired(self, future):
+        if self.started is None or future.done():
+            return False
+        if self.started + self.seconds > monotonic():
+            return False
+        if not future.running():
+            # Only the submission to a process pool is known, its
+            # functions don't time out before a worker has taken them
+            self.started = monotonic()
+            return False
+        return True
+
+
+def _remaining(entries):
+    # How long to wait for the next of the (_, deadline, _) entries to
+    # time out, None if none of them has a timeout
+    remaining = [
+        deadline.remaining() for _, deadline, _ in entries if deadline is not None
+    ]
+    return min(remaining) if remaining else None
+
+
+class _ResultCache:
+    """
+    The results of a function cached with option_cache, keyed by
+    the arguments it was called with.
+    """
+
+    __slots__ = ("maxsize", "ttl", "key", "_results", "_lock")
+
+    def __init__(self, maxsize=128, ttl=None, key=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.key = key
+        self._results = OrderedDict()
+        self._lock = Lock()
+
+    def lookup(self, function, args, kwargs):
+        """
+        Returns the key the result of calling the function with the
+        given arguments is cached under (None if it can't be cached)
+        and the cached result (or _missing).
+        """
+        if self.key is not None:
+            key = self.key(*args, **kwargs)
+        else:
+            key = (args, tuple(sorted(kwargs.items())))
+        # Methods of different instances don't share their results,
+        # even if they are wrapped (e.g. to give them a docstring)
+        method = unwrap(function, stop=ismethod)
+        if ismethod(method):
+            key = (method.__self__, key)
+        try:
+            hash(key)
+        except TypeError:
+            return None, _missing
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None:
+                return key, _missing
+            result, stored = entry
+            if self.ttl is not None and monotonic() - stored > self.ttl:
+                del self._results[key]
+                return key, _missing
+            self._results.move_to_end(key)
+            return key, result
+
+    def store(self, key, result):
+        if key is None or isinstance(result, TimedOut):
+            return
+        with self._lock:
+            self._results[key] = (result, monotonic())
+            self._results.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._results) > self.maxsize:
+                    self._results.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+
+class _Speculation:
+    """
+    The options of an InquirerExecutorList that are executed in the
+    background while the user is still choosing, along with the
+    arguments they are executed with.
+    """
+
+    __slots__ = ("args", "kwargs", "futures")
+
+    def __init__(self, args, kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        self.futures = {}
+
+    def start(self, function):
+        future = self.futures.get(function)
+        if future is not None and not future.cancelled():
+            return
+        # Only the latest option is kept waiting for a worker
+        for future in self.futures.values():
+            future.cancel()
+        self.futures[function] = _speculation_pool().submit(
+            function, *self.args, **self.kwargs
+        )
+
+    def take(self, function):
+        future = self.futures.pop(function, None)
+        if future is None or future.cancelled():
+            return None
+        return future
+
+    def discard(self):
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+
+
+class _ExecutionPlan:
+    """
+    Keeps track of which functions of an execution stack are ready
+    to be executed, given the functions they depend on (see
+    depends_on) and the resources they use (see uses_resources).
+    Functions are referred to by their index in the stack.
+    """
+
+    __slots__ = (
+        "resources",
+        "limits",
+        "in_use",
+        "dependents",
+        "waiting",
+        "priorities",
+        "ready",
+        "skipped",
+        "unfinished",
+    )
+
+    def __init__(self, functions, limits):
+        functions = list(functions)
+        self.resources = [getattr(function, "_resources", ()) for function in functions]
+        self.limits = limits
+        self.in_use = {}
+        self.dependents = [[] for _ in functions]
+        self.waiting = [0] * len(functions)
+        positions = {}
+        unhashable = []
+        for index, function in enumerate(functions):
+            try:
+                positions.setdefault(function, []).append(index)
+            except TypeError:
+                unhashable.append(index)
+        for index, function in enumerate(functions):
+            for dependency in getattr(function, "_depends_on", ()):
+                # Only the functions that have been chosen as well
+                # need to be waited for
+                try:
+                    dependencies = positions.get(dependency, ())
+                except TypeError:
+                    dependencies = [i for i in unhashable if functions[i] == dependency]
+                for position in dependencies:
+                    self.dependents[position].append(index)
+                    self.waiting[index] += 1
+        # Functions with the longest chain of functions depending on
+        # them are started first, so the chains finish as early as
+        # possible when there are more functions ready than workers
+        self.priorities = [0] * len(functions)
+        for index in reversed(self._order()):
+            self.priorities[index] = 1 + max(
+                (self.priorities[dependent] for dependent in self.dependents[index]),
+                default=0,
+            )
+        self.ready = [
+            (-self.priorities[index], index)
+            for index, waiting in enumerate(self.waiting)
+            if not waiting
+        ]
+        self.ready.sort()
+        self.skipped = set()
+        self.unfinished = len(functions)
+
+    def _order(self):
+        # Returns the indices in an order in which every function comes
+        # after the ones it depends on
+        waiting = list(self.waiting)
+        order = [index for index, count in enumerate(waiting) if not count]
+        for index in order:
+            for dependent in self.dependents[index]:
+                waiting[dependent] -= 1
+                if not waiting[dependent]:
+                    order.append(dependent)
+        if len(order) < len(waiting):
+            raise ValueError("The chosen functions depend on each other in a cycle.")
+        return order
+
+    def take(self):
+        """
+        Returns the indices of the functions that are ready and whose
+        resources are available, which are then marked as in use.
+        """
+        taken = []
+        blocked = []
+        while self.ready:
+            entry = heappop(self.ready)
+            resources = self.resources[entry[1]]
+            if any(
+                self.in_use.get(tag, 0) >= self.limits.get(tag, 1) for tag in resources
+            ):
+                blocked.append(entry)
+                continue
+            for tag in resources:
+                self.in_use[tag] = self.in_use.get(tag, 0) + 1
+            taken.append(entry[1])
+        for entry in blocked:
+            heappush(self.ready, entry)
+        return taken
+
+    def release(self, index):
+        for tag in self.resources[index]:
+            self.in_use[tag] -= 1
+
+    def finish(self, index, succeeded):
+        """
+        Marks the function as finished, which makes the functions
+        depending on it ready, if it succeeded, or skips them (and
+        the functions depending on them), if it didn't.
+        """
+        self.unfinished -= 1
+        if succeeded:
+            for dependent in self.dependents[index]:
+                self.waiting[dependent] -= 1
+                if not self.waiting[dependent] and dependent not in self.skipped:
+                    heappush(self.ready, (-self.priorities[dependent], dependent))
+            return
+        dependents = list(self.dependents[index])
+        while dependents:
+            dependent = dependents.pop()
+            if dependent not in self.skipped:
+                self.skipped.add(dependent)
+                self.unfinished -= 1
+                dependents.extend(self.dependents[dependent])
+
+
+_speculation_pool_instance = None
+_speculation_pool_lock = Lock()
+
+
+def _speculation_pool():
+    global _speculation_pool_instance
+    with _speculation_pool_lock:
+        if _speculation_pool_instance is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            _speculation_pool_instance = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="inquirer-executor-speculation"
+            )
+        return _speculation_pool_instance
+
+
+class QuestionsCatalogue(_Executing, list):
+    """
+    This class inherits from list, so it can be used like a list,
+    the only two things is sets itself apart from the built-in list
+    is that fact that it type-checks it's members and offers the
+    prompt_all() method. (Request help() for this method for more
+    information.)
+    All members of the list must either be instances of question
+    types offered by the inquirer package, or instances of
+    InquirerExecutorCheckbox or InquirerExecutorList.
+    The chosen functions can be executed with the execute() method,
+    by default one after another. Passing "thread", "process" or an
+    instance of concurrent.futures.Executor as executor runs the
+    ones that don't depend on each other concurrently instead.
+    """
+
+    def __init__(
+        self,
+        list_of_questions,
+        executor=None,
+        max_workers=None,
+        resource_limits=None,
+        timeout=None,
+    ):
+        if not isinstance(list_of_questions, (list, tuple, set, frozenset)):
+            raise TypeError("You need to instantiate this class with an iterable type.")
+        if executor not in (None, "thread", "process") and not _is_executor(executor):
+            raise ValueError(
+                'The executor needs to be "thread", "process" or an instance of concurrent.futures.Executor.'
+            )
+        resource_limits = dict(resource_limits or {})
+        for tag, limit in resource_limits.items():
+            if not isinstance(limit, int) or limit < 1:
+                raise ValueError(
+                    "The limit of the resource {!r} needs to be a positive integer.".format(
+                        tag
+                    )
+                )
+        l = []
+        for question in list_of_questions:
+            l.append(self._check_item_type(question))
+        super().__init__(l)
+        self._observers = ()
+        self.executor = executor
+        self.max_workers = max_workers
+        self.resource_limits = resource_limits
+        self.timeout = timeout
+        self.execution_stack = []
+        self.answer_dict = {}
+
+    @staticmethod
+    def _check_item_type(question):
+        if isinstance(question, (InquirerExecutorCheckbox, InquirerExecutorList)):
+            return question
+        # Questions of the inquirer package can't have been created
+        # without importing it, so there is no need to import it here
+        inquirer = sys.modules.get("inquirer")
+        if inquirer is None or not isinstance(
+            question,
+            (
+                inquirer.List,
+                inquirer.Checkbox,
+                inquirer.Path,
+                inquirer.Editor,
+                inquirer.Text,
+            ),
+        ):
+            raise TypeError(
+                "Every item in the iterable must be an instance of an Inquirer or InquirerExecutor class."
+            )
+        return question
+
+    def prompt_all(self, answers=None):
+        """
+        Prompts the user for all questions in the list.
+        The method returns a tuple made up of a dict of answers
+        to the questions that have been constructed using the "inquirer"-
+        package (of the kind the package would return itself)
+        and a list of functions that have been selected by
+        the user during the course of answering all of the questions.
+        Consecutive questions constructed using the "inquirer"-package
+        are prompted together.
+        If answers are passed (see AnswerProvider), all answers are
+        taken from them instead and the user is not prompted.
+        Every call starts with a new dict of answers and list of
+        functions, the ones of earlier calls are left as they are.
+        """
+        if answers is None and _replayers:
+            answers = _replayers[-1]
+        if answers is not None:
+            answers = AnswerProvider.wrap(answers)
+        self.answer_dict = {}
+        self.execution_stack = []
+        with self._observing():
+            self._prompt_all(answers)
+        return (self.answer_dict, self.execution_stack)
+
+    def iter_prompt(self, answers=None, skip=None):
+        """
+        Does the same as prompt_all(), but returns an iterator that
+        prompts the questions one at a time and yields a (question,
+        answer) tuple as soon as each of them has been answered. For
+        InquirerExecutorList and InquirerExecutorCheckbox instances,
+        the answer is the chosen function or list of functions.
+        Stopping the iteration early leaves the remaining questions
+        unasked.
+        If passed, skip is called with every question, the dict of
+        answers and the list of functions of the current run before
+        the question is prompted, and the question is skipped if it
+        returns True.
+        """
+        if answers is None and _replayers:
+            answers = _replayers[-1]
+        if answers is not None:
+            answers = AnswerProvider.wrap(answers)
+        # Every run gets its own state, so the state of a run that
+        # hasn't finished yet isn't changed by another one
+        answer_dict = self.answer_dict = {}
+        execution_stack = self.execution_stack = []
+        for question in self:
+            if skip is not None and skip(question, answer_dict, execution_stack):
+                continue
+            # Observing only while prompting, since the code of the caller
+            # runs in between and may prompt questions of its own
+            with self._observing():
+                if isinstance(question, InquirerExecutorList):
+                    answer = question.prompt_user(answers=answers).find_function()
+                    execution_stack.append(answer)
+                elif isinstance(question, InquirerExecutorCheckbox):
+                    answer = question.prompt_user(answers=answers).find_functions()
+                    execution_stack.extend(answer)
+                else:
+                    answer = self._prompt_questions([question], answers)
+                    answer_dict.update(answer)
+                    answer = answer.get(question.name)
+            yield question, answer
+
+    @contextmanager
+    def _observing(self):
+        # The observers of the catalogue observe its questions as well,
+        # but only while they are prompted by the catalogue, so the
+        # questions prompted by other threads (or tasks) aren't observed
+        token = _scoped_observers.set(_scoped_observers.get() + self._observers)
+        try:
+            yield
+        finally:
+            _scoped_observers.reset(token)
+
+    def _prompt_all(self, answers):
+        # Collecting consecutive inquirer questions, so they can be
+        # prompted at once instead of setting up the terminal for each
+        questions = []
+        for question in self:
+            if isinstance(question, (InquirerExecutorList, InquirerExecutorCheckbox)):
+                if questions:
+                    self.answer_dict.update(self._prompt_questions(questions))
+                    questions = []
+                question.prompt_user(answers=answers)
+            if isinstance(question, InquirerExecutorList):
+                self.execution_stack.append(question.find_function())
+            elif isinstance(question, InquirerExecutorCheckbox):
+                self.execution_stack.extend(question.find_functions())
+            elif answers is not None:
+                self.answer_dict.update(self._prompt_questions([question], answers))
+            else:
+                questions.append(question)
+        if questions:
+            self.answer_dict.update(self._prompt_questions(questions))
+
+    def _emit(self, kind, option=None, exception=None):
+        if _observers or self._observers:
+            _fire(
+                _observers + list(self._observers),
+                Event(kind, monotonic(), self, option, exception),
+            )
+
+    def execute(self, *args, **kwargs):
+        """
+        Executes the functions of the execution_stack with the passed
+        in args and kwargs, each one only after the functions it
+        depends on (see depends_on) have finished, and no more of
+        them at once than the limits of the resources they use allow
+        (see uses_resources).
+        Returns a list of the called functions return values, in the
+        order of the execution_stack.
+        If any of them failed, an ExecutionError is raised after all
+        others have finished. The functions depending on a function
+        that failed or timed out are not executed.
+        """
+        timeout = kwargs.pop("_timeout", None)
+        if not self.execution_stack:
+            raise ValueError("Execution not possible since no answer was provided.")
+        plan = _ExecutionPlan(self.execution_stack, self.resource_limits)
+        if self.executor is None:
+            r, errors = self._execute_plan(plan, args, kwargs, timeout)
+        elif _is_executor(self.executor):
+            r, errors = self._execute_plan_concurrently(
+                plan, self.executor, args, kwargs, timeout
+            )
+        else:
+            pool = self._create_pool()
+            try:
+                r, errors = self._execute_plan_concurrently(
+                    plan, pool, args, kwargs, timeout
+                )
+            finally:
+                # Not waiting for functions that timed out
+                pool.shutdown(wait=False)
+        if errors or plan.skipped:
+            skipped = [self.execution_stack[index] for index in sorted(plan.skipped)]
+            raise ExecutionError(r, errors, skipped)
+        return r
+
+    def _execute_plan(self, plan, args, kwargs, timeout):
+        r = [None] * len(self.execution_stack)
+        errors = []
+        while plan.unfinished:
+            for index in plan.take():
+                function = self.execution_stack[index]
+                try:
+                    r[index] = self._call(function, args, kwargs, timeout)
+                except Exception as exception:
+                    errors.append((function, exception))
+                    succeeded = False
+                else:
+                    succeeded = not isinstance(r[index], TimedOut)
+                plan.release(index)
+                plan.finish(index, succeeded)
+        return r, errors
+
+    def _execute_plan_concurrently(self, plan, pool, args, kwargs, timeout):
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        r = [None] * len(self.execution_stack)
+        errors = []
+        # Maps the futures of the functions that have been started to
+        # their index in the execution_stack, the deadline and timeout
+        running = {}
+        try:
+            while plan.unfinished:
+                for index in plan.take():
+                    future, deadline, seconds = self._submit_one(
+                        pool, self.execution_stack[index], args, kwargs, timeout
+                    )
+                    running[future] = (index, deadline, seconds)
+                done, _ = wait(running, _remaining(running.values()), FIRST_COMPLETED)
+                for future in done:
+                    index, _, _ = running.pop(future)
+                    plan.release(index)
+                    exception = future.exception()
+                    if exception is None:
+                        r[index] = future.result()
+                    else:
+                        errors.append((self.execution_stack[index], exception))
+                    plan.finish(index, exception is None)
+                for future, (index, deadline, seconds) in list(running.items()):
+                    if deadline is not None and deadline.expired(future):
+                        # A function that timed out may keep running in
+                        # the background, but it gives up its resources,
+                        # so the functions waiting for them aren't held
+                        # up any longer than the timeout
+                        future.cancel()
+                        del running[future]
+                        plan.release(index)
+                        r[index] = TimedOut(self.execution_stack[index], seconds)
+                        plan.finish(index, False)
+        except BaseException:
+            # E.g. a KeyboardInterrupt, the functions that haven't been
+            # started yet are not started anymore
+            for future in running:
+                future.cancel()
+            raise
+        return r, errors
+
+    def _prompt_questions(self, questions, answers=None):
+        started = time()
+        names = tuple(question.name for question in questions)
+        self._emit("prompt_start", names)
+        backend = _backend if answers is None else HeadlessBackend(answers)
+        try:
+            answers = backend.prompt_questions(questions)
+        except BaseException as exception:
+            self._emit("prompt_end", names, exception)
+            raise
+        self._emit("prompt_end", names)
+        if _recorders:
+            for question in questions:
+                _record(question.name, answers.get(question.name), [], started)
+        return answers
+
+
+class AnswerProvider:
+    """
+    Provides answers to questions without prompting the user,
+    e.g. for running scripts non-interactively.
+    The answers can either be
+    - a dict mapping the message of an InquirerExecutor instance
+      (or the name of an inquirer question) to its answer,
+    - any other iterable of answers, which are handed out in
+      the order the questions are asked in, or
+    - the path to a JSON (or, if PyYAML is installed, YAML) file
+      containing either of the above.
+    Answers to InquirerExecutor instances are the docstrings of
+    the chosen functions, for InquirerExecutorCheckbox instances
+    a list of them.
+    """
+
+    def __init__(self, answers):
+        if isinstance(answers, (str, PathLike)):
+            answers = self._load(fspath(answers))
+        if isinstance(answers, dict):
+            self._answers = answers
+            self._iterator = None
+        else:
+            self._answers = None
+            self._iterator = iter(answers)
+
+    @classmethod
+    def wrap(cls, answers):
+        """
+        Returns answers unchanged if they already are an
+        AnswerProvider, else an AnswerProvider for them.
+        """
+        return answers if isinstance(answers, cls) else cls(answers)
+
+    @staticmethod
+    def _load(path):
+        with open(path) as f:
+            if not path.endswith((".yaml", ".yml")):
+                return json.load(f)
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(
+                    "Reading answers from YAML files requires PyYAML to be installed."
+                )
+            return yaml.safe_load(f)
+
+    def answer_for(self, key):
+        """
+        Returns the answer for the question identified by key,
+        which is the message of an InquirerExecutor instance or
+        the name of an inquirer question.
+        """
+        if self._iterator is None:
+            try:
+                return self._answers[key]
+            except KeyError:
+                raise ValueError("No answer was provided for {!r}.".format(key))
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise ValueError("Ran out of answers at {!r}.".format(key))
+
+
+class PromptBackend(ABC):
+    """
+    The interface between InquirerExecutor and whatever presents
+    the questions to the user. Set the backend to use with
+    set_backend().
+    """
+
+    @abstractmethod
+    def prompt(self, executor, **kwargs):
+        """
+        Presents the options of an InquirerExecutor instance to
+        the user and returns the answer: the docstring of the
+        chosen option, or a list of docstrings for checkboxes.
+        """
+
+    def prompt_questions(self, questions, **kwargs):
+        """
+        Prompts questions created with the inquirer package (as
+        part of a QuestionsCatalogue) and returns a dict mapping
+        their names to the answers. By default inquirer is used.
+        """
+        return prompt(questions, **kwargs)
+
+
+class InquirerBackend(PromptBackend):
+    """
+    Prompts the user with inquirer. This is the default backend.
+    Filterable lists ask for a search term first and only present
+    the matching options.
+    """
+
+    def prompt(self, executor, **kwargs):
+        if not getattr(executor, "filterable", False):
+            return prompt(executor._question, **kwargs)["omittet"]
+        message = "Filter the options (leave empty to show all)"
+        while True:
+            search_term = prompt(
+                [_inquirer().Text("search_term", message=message)], **kwargs
+            )
+            choices = executor.filter(search_term["search_term"])
+            if choices:
+                break
+            message = "No option contains {!r}, try again".format(
+                search_term["search_term"]
+            )
+        question_kwargs = dict(message=executor.message, choices=choices)
+        if executor.carousel:
+            question_kwargs.update(carousel=executor.carousel)
+        return prompt([_inquirer().List("omittet", **question_kwargs)], **kwargs)[
+            "omittet"
+        ]
+
+
+class AnsiBackend(PromptBackend):
+    """
+    Renders the options with plain ANSI escape sequences instead
+    of inquirer. Only the options around the cursor are rendered
+    (at most height of them), so moving through huge numbers of
+    options stays fast. Filterable lists are filtered with every
+    key typed. Further keyword arguments (e.g. theme) are ignored,
+    questions created with the inquirer package are still prompted
+    with inquirer.
+    """
+
+    def __init__(self, height=10, stream=None, readkey=None):
+        self.height = height
+        self.stream = stream
+        self.readkey = readkey
+
+    def prompt(self, executor, **kwargs):
+        from readchar import key, readkey
+
+        readkey = self.readkey or readkey
+        stream = self.stream or sys.stdout
+        multiple = isinstance(executor, InquirerExecutorCheckbox)
+        filterable = getattr(executor, "filterable", False)
+        choices = visible = executor._choices()
+        selected = set()
+        search_term = ""
+        cursor = 0
+        lines = 0
+        highlighted = None
+        while True:
+            if visible and visible[cursor] != highlighted:
+                highlighted = visible[cursor]
+                executor._highlighted(highlighted)
+            lines = self._render(
+                stream,
+                lines,
+                self._header(executor.message, search_term if filterable else None),
+                visible,
+                cursor,
+                selected if multiple else None,
+            )
+            pressed = readkey()
+            if pressed in (key.ENTER, "\r", "\n"):
+                if multiple:
+                    answer = [choice for choice in choices if choice in selected]
+                    break
+                if visible:
+                    answer = visible[cursor]
+                    break
+            elif pressed == key.CTRL_C:
+                self._render(stream, lines, "", [], 0, None)
+                raise KeyboardInterrupt
+            elif pressed in (key.UP, key.DOWN, key.PAGE_UP, key.PAGE_DOWN):
+                step = 1 if pressed in (key.UP, key.DOWN) else self.height
+                step = -step if pressed in (key.UP, key.PAGE_UP) else step
+                cursor = self._move(cursor, step, len(visible), executor.carousel)
+            elif pressed == key.SPACE and multiple and visible:
+                selected ^= {visible[cursor]}
+            elif filterable and pressed == key.BACKSPACE:
+                search_term = search_term[:-1]
+                visible = executor.filter(search_term)
+                cursor = 0
+            elif filterable and len(pressed) == 1 and pressed.isprintable():
+                search_term += pressed
+                visible = executor.filter(search_term)
+                cursor = 0
+        shown = ", ".join(answer) if multiple else answer
+        self._render(stream, lines, self._header(executor.message, shown), [], 0, None)
+        return answer
+
+    @staticmethod
+    def _header(message, text):
+        header = "\x1b[1m[?]\x1b[0m {}".format(message)
+        return header if text is None else "{}: {}".format(header, text)
+
+    @staticmethod
+    def _move(cursor, step, count, carousel):
+        if not count:
+            return 0
+        if carousel and abs(step) == 1:
+            return (cursor + step) % count
+        return min(max(cursor + step, 0), count - 1)
+
+    def _render(self, stream, lines, header, visible, cursor, selected):
+        # Rendering only a window of the options around the cursor
+        start = min(
+            max(cursor - self.height // 2, 0), max(len(visible) - self.height, 0)
+        )
+        rows = [header]
+        for position in range(start, min(start + self.height, len(visible))):
+            label = visible[position]
+            if selected is not None:
+                label = "{} {}".format("[X]" if label in selected else "[ ]", label)
+            if position == cursor:
+                rows.append("\x1b[7m > {}\x1b[0m".format(label))
+            else:
+                rows.append("   {}".format(label))
+        # Moving up to the first line rendered before and replacing it
+        moving_up = "\x1b[{}F".format(lines) if lines else ""
+        stream.write("{}\x1b[J{}\n".format(moving_up, "\n".join(rows)))
+        stream.flush()
+        return len(rows)
+
+
+class HeadlessBackend(PromptBackend):
+    """
+    Doesn't prompt the user at all, but takes the answers from an
+    AnswerProvider (or anything AnswerProvider accepts). Answers
+    that don't match any option raise a ValueError.
+    """
+
+    def __init__(self, answers):
+        self.answers = AnswerProvider.wrap(answers)
+
+    def prompt(self, executor, **kwargs):
+        return executor._check_answer(self.answers.answer_for(executor.message))
+
+    def prompt_questions(self, questions, **kwargs):
+        return {
+            question.name: self.answers.answer_for(question.name)
+            for question in questions
+        }
+
+
+class FakeBackend(HeadlessBackend):
+    """
+    A HeadlessBackend for tests, which also keeps track of what
+    would have been presented to the user: its prompted attribute
+    is a list of (message, choices) tuples, where the message of
+    questions created with the inquirer package is their name and
+    their choices are None.
+    """
+
+    def __init__(self, answers):
+        super().__init__(answers)
+        self.prompted = []
+
+    def prompt(self, executor, **kwargs):
+        self.prompted.append((executor.message, list(executor._choices())))
+        return super().prompt(executor, **kwargs)
+
+    def prompt_questions(self, questions, **kwargs):
+        self.prompted.extend((question.name, None) for question in questions)
+        return super().prompt_questions(questions, **kwargs)
+
+
+_backend = InquirerBackend()
+
+
+def set_backend(backend):
+    """
+    Sets the PromptBackend all questions are prompted with from
+    now on (unless answers are passed), and returns the one that
+    was set before.
+    """
+    global _backend
+    if not isinstance(backend, PromptBackend):
+        raise TypeError("The backend needs to be an instance of PromptBackend.")
+    previous, _backend = _backend, backend
+    return previous
+
+
+class _ChoiceTable:
+    """
+    The docstrings of a set of options, along with the structures
+    for looking them up. All instances with the same options (the
+    same functions in the same order) share one table, which is
+    dropped once none of them uses it anymore.
+    """
+
+    __slots__ = ("options", "labels", "_index", "_search_index", "__weakref__")
+
+    _tables = WeakValueDictionary()
+    _lock = Lock()
+
+    def __init__(self, options, labels=None):
+        self.options = options
+        if labels is None:
+            labels = tuple(_label(option) for option in options)
+        self.labels = labels
+        self._index = None
+        self._search_index = None
+
+    @classmethod
+    def shared(cls, options):
+        options = tuple(options)
+        # Identifying the functions by identity, the table keeps them
+        # alive, so their ids aren't reused while it is kept
+        key = tuple(map(id, options))
+        # Rendering the labels may run code of the user (see
+        # dynamic_docstring_decorator), which may build other tables,
+        # so it is done without holding the lock
+        labels = tuple(_label(option) for option in options)
+        with cls._lock:
+            table = cls._tables.get(key)
+            # Docstrings can be changed, so a table is only reused as
+            # long as its labels are still the current ones
+            if table is None or table.labels != labels:
+                table = cls._tables[key] = cls(options, labels)
+        return table
+
+    @property
+    def index(self):
+        # Maps every docstring to its function, so answers can be resolved
+        # without scanning the options. Iterating in reverse lets the first
+        # of several options sharing a docstring win.
+        if self._index is None:
+            self._index = dict(zip(reversed(self.labels), reversed(self.options)))
+        return self._index
+
+    @property
+    def search_index(self):
+        if self._search_index is None:
+            self._search_index = _SearchIndex(self.labels)
+        return self._search_index
+
+
+class _SearchIndex:
+    """
+    A trigram index over a list of strings, for finding the ones
+    containing a search term without looking at all of them.
+    """
+
+    def __init__(self, strings):
+        self._strings = strings
+        self._lowered = [(string or "").lower() for string in strings]
+        self._trigrams = {}
+        for position, string in enumerate(self._lowered):
+            for trigram in self._split(string):
+                self._trigrams.setdefault(trigram, []).append(position)
+
+    @staticmethod
+    def _split(string):
+        return {string[i : i + 3] for i in range(len(string) - 2)}
+
+    def search(self, search_term):
+        search_term = search_term.lower()
+        if len(search_term) < 3:
+            # Too short to have trigrams, so every string needs to be checked
+            candidates = range(len(self._lowered))
+        else:
+            trigrams = self._split(search_term)
+            postings = sorted(
+                (self._trigrams.get(trigram, ()) for trigram in trigrams), key=len
+            )
+            candidates = set(postings[0]).intersection(*postings[1:])
+            # Trigrams matching doesn't mean they are adjacent, verified below
+            candidates = sorted(candidates)
+        return [
+            self._strings[position]
+            for position in candidates
+            if search_term in self._lowered[position]
+        ]
+
+
+Event = namedtuple("Event", ["kind", "timestamp", "source", "option", "exception"])
+Event.__doc__ = """
+An event fired by InquirerExecutor and QuestionsCatalogue instances.
+kind is one of "question_build", "prompt_start", "prompt_end",
+"answer_resolved", "execution_start", "execution_end" and
+"cache_hit".
+timestamp is taken from time.monotonic(), source is the instance
+firing the event, option the function (or list of functions, or
+names of inquirer questions) it concerns, and exception the
+exception that was raised, if any.
+"""
+
+# Observers of all instances, and the ones of the QuestionsCatalogue
+# instances that are currently prompting in the current thread (or task)
+_observers = []
+_scoped_observers = ContextVar("scoped_observers", default=())
+
+
+def add_observer(observer):
+    """
+    Registers an observer, a callable that is called with every
+    Event fired by any InquirerExecutor or QuestionsCatalogue
+    instance.
+    """
+    _observers.append(observer)
+
+
+def remove_observer(observer):
+    """
+    Unregisters an observer registered with add_observer().
+    """
+    _observers.remove(observer)
+
+
+def _fire(observers, event):
+    for observer in observers:
+        observer(event)
+
+
+def _describe(option):
+    if isinstance(option, (list, tuple)):
+        return [_describe(item) for item in option]
+    return _qualified_name(option) if callable(option) else option
+
+
+class LatencyHistogram:
+    """
+    An observer measuring how long it took for users to answer
+    the prompts and for the chosen functions to execute.
+    The durations are sorted into buckets with the given upper
+    bounds (in seconds), see summary().
+    """
+
+    bounds = (0.001, 0.01, 0.1, 1, 10, 60)
+
+    def __init__(self, bounds=None):
+        if bounds is not None:
+            self.bounds = tuple(sorted(bounds))
+        self._started = {}
+        self._lock = Lock()
+        self._histograms = {}
+
+    def __call__(self, event):
+        category, _, edge = event.kind.rpartition("_")
+        if edge not in ("start", "end"):
+            return
+        key = (category, id(event.source), event.option)
+        with self._lock:
+            if edge == "start":
+                self._started[key] = event.timestamp
+                return
+            started = self._started.pop(key, None)
+            if started is None:
+                return
+            duration = event.timestamp - started
+            self._add(category, duration)
+            if category == "execution":
+                self._add("execution " + _qualified_name(event.option), duration)
+
+    def _add(self, category, duration):
+        histogram = self._histograms.get(category)
+        if histogram is None:
+            histogram = self._histograms[category] = dict(
+                count=0,
+                total=0.0,
+                min=duration,
+                max=duration,
+                buckets=[0] * (len(self.bounds) + 1),
+            )
+        histogram["count"] += 1
+        histogram["total"] += duration
+        histogram["min"] = min(histogram["min"], duration)
+        histogram["max"] = max(histogram["max"], duration)
+        histogram["buckets"][bisect_left(self.bounds, duration)] += 1
+
+    def summary(self):
+        """
+        Returns a dict mapping "prompt" (the time spent waiting
+        for the user), "execution" (the time spent executing the
+        chosen functions) and "execution <function>" (the same for
+        every single function) to a dict with the count, total,
+        mean, min and max of the durations, as well as the number
+        of durations per bucket.
+        """
+        labels = ["<={}".format(bound) for bound in self.bounds] + [
+            ">{}".format(self.bounds[-1])
+        ]
+        with self._lock:
+            return {
+                category: dict(
+                    count=histogram["count"],
+                    total=histogram["total"],
+                    mean=histogram["total"] / histogram["count"],
+                    min=histogram["min"],
+                    max=histogram["max"],
+                    buckets=dict(zip(labels, histogram["buckets"])),
+                )
+                for category, histogram in self._histograms.items()
+            }
+
+
+class JsonlEventWriter:
+    """
+    An observer appending every Event to the file at path as a
+    line of JSON. Can be used as a context manager, which closes
+    the file on exit.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "a")
+        self._lock = Lock()
+
+    def __call__(self, event):
+        source = event.source
+        record = dict(
+            kind=event.kind,
+            timestamp=event.timestamp,
+            source=type(source).__name__,
+            message=getattr(source, "message", None),
+            option=_describe(event.option),
+            exception=None if event.exception is None else repr(event.exception),
+        )
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# The currently active SessionRecorder and SessionReplayer instances
+_recorders = []
+_replayers = []
+
+
+def _qualified_name(function):
+    if not hasattr(function, "__qualname__"):
+        return repr(function)
+    return "{}.{}".format(function.__module__, function.__qualname__)
+
+
+def _record(question, answer, functions, started):
+    record = dict(
+        question=question,
+        answer=answer,
+        functions=[_qualified_name(function) for function in functions],
+        started=started,
+        finished=time(),
+    )
+    line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+    for recorder in _recorders:
+        recorder._write(line)
+
+
+class SessionRecorder:
+    """
+    A context manager that records every answer given to
+    InquirerExecutor instances and QuestionsCatalogue.prompt_all()
+    while it is active.
+    Each answer is appended to the file at path as a line of JSON,
+    holding the message (or name) of the question, the answer,
+    the chosen functions and when the user was prompted and
+    when they answered.
+    The recorded session can be replayed with SessionReplayer.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a")
+        _recorders.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _recorders.remove(self)
+        self._file.close()
+        self._file = None
+
+    def _write(self, line):
+        self._file.write(line)
+        # Flushing every record, so a crashing session is recorded as well
+        self._file.flush()
+
+
+class SessionReplayer(AnswerProvider):
+    """
+    Answers questions from a session recorded by SessionRecorder,
+    in the order they have been recorded in, without prompting
+    the user.
+    It can either be passed as answers (see AnswerProvider) or be
+    used as a context manager, in which case it answers every
+    question asked while it is active.
+    If a question is asked that differs from the one recorded
+    next, a ValueError is raised.
+    """
+
+    def __init__(self, path):
+        with open(fspath(path)) as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        super().__init__(records)
+
+    def __enter__(self):
+        _replayers.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _replayers.remove(self)
+
+    def answer_for(self, key):
+        record = super().answer_for(key)
+        if record["question"] != key:
+            raise ValueError(
+                "Expected the question {!r} to be asked next, not {!r}.".format(
+                    record["question"], key
+                )
+            )
+        return record["answer"]
+
+
+# Signature fingerprints keyed by the code object they were taken from,
+# so e.g. the bound methods of many instances are only introspected once.
+_signature_cache = {}
+
+
+def _signature_key(function):
+    # The code object of the function (None if it has none) and whether
+    # it is bound, which together determine its parameters
+    bound = ismethod(function)
+    code = getattr(unwrap(function.__func__ if bound else function), "__code__", None)
+    return code, bound
+
+
+def _signature_fingerprint(function):
+    """
+    Returns a hashable representation of the names and kinds
+    (positional, keyword-only, *args, **kwargs) of the
+    parameters a function accepts when being called.
+    """
+    key = _signature_key(function)
+    code = key[0]
+    if code is not None and key in _signature_cache:
+        return _signature_cache[key]
+    try:
+        parameters = signature(function).parameters.values()
+    except ValueError:
+        raise TypeError("Could not determine the parameters of {!r}.".format(function))
+    fingerprint = tuple((parameter.name, parameter.kind) for parameter in parameters)
+    if code is not None:
+        _signature_cache[key] = fingerprint
+    return fingerprint
+
+
+def dynamic_docstring_decorator(docstring, *args, **kwargs):
+    """
+    A decorator that allows for dynamic creation of docstrings.
+    Functions (and methods) are copied, so the same function can be
+    decorated with several docstrings without them overwriting each
+    other, and calling the copy costs nothing extra.
+    If further arguments are passed, the docstring is a template
+    that is formatted with them, or a callable that is called with
+    them. Either way it is only rendered (once) when the function
+    is displayed as an option for the first time.
+    """
+
+    def set_docstring(func):
+        if args or kwargs or callable(docstring):
+            func._lazy_docstring = (docstring, args, kwargs)
+        else:
+            func.__doc__ = docstring
+        return func
+
+    def dynamic_docstring_decorator_wrap(func):
+        bound = ismethod(func)
+        function = func.__func__ if bound else func
+        if isinstance(function, FunctionType):
+            copy = set_docstring(_copy_function(function))
+            return MethodType(copy, func.__self__) if bound else copy
+
+        # E.g. builtins or callable objects, which can't be copied
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return set_docstring(wrapper)
+
+    return dynamic_docstring_decorator_wrap
+
+
+def _copy_function(function):
+    # A new function running the same code, whose attributes can be
+    # changed without changing the ones of the original function
+    copy = FunctionType(
+        function.__code__,
+        function.__globals__,
+        function.__name__,
+        function.__defaults__,
+        function.__closure__,
+    )
+    copy.__kwdefaults__ = function.__kwdefaults__
+    # Keeping the annotations (and type parameters) and a __wrapped__
+    # attribute, as the wrapper of @wraps did
+    update_wrapper(copy, function)
+    copy.__annotations__ = dict(function.__annotations__)
+    return copy
+
+
+def option_timeout(seconds):
+    """
+    A decorator that sets the number of seconds InquirerExecutor
+    waits for the decorated function to finish when executing it.
+    """
+
+    def option_timeout_wrap(func):
+        func._option_timeout = seconds
+        return func
+
+    return option_timeout_wrap
+
+
+def option_cache(maxsize=128, ttl=None, key=None):
+    """
+    A decorator that has InquirerExecutor cache the return values
+    of the decorated function, so it is only executed again when
+    it is chosen with different arguments. At most maxsize results
+    (None for no limit) are kept, each for at most ttl seconds
+    (None for no limit). If passed, key is called with the arguments
+    instead of them being used to look up the result.
+    Calling the function directly bypasses the cache.
+    """
+
+    def option_cache_wrap(func):
+        func._result_cache = _ResultCache(maxsize, ttl, key)
+        return func
+
+    return option_cache_wrap
+
+
+def depends_on(*functions):
+    """
+    A decorator that has QuestionsCatalogue.execute() execute the
+    decorated function only after the given functions have finished
+    successfully, if they have been chosen as well.
+    """
+
+    def depends_on_wrap(func):
+        func._depends_on = functions
+        return func
+
+    return depends_on_wrap
+
+
+def uses_resources(*tags):
+    """
+    A decorator tagging the decorated function with the resources
+    it uses. QuestionsCatalogue.execute() runs no more functions
+    using a resource at once than the resource_limits of the
+    catalogue allow (one, if the resource has no limit).
+    """
+
+    def uses_resources_wrap(func):
+        func._resources = tags
+        return func
+
+    return uses_resources_wrap
+
+
+def side_effect_free(func):
+    """
+    A decorator marking a function as free of side effects, so it
+    may be executed before it is chosen (see the speculative
+    argument of InquirerExecutorList).
+    """
+    func._side_effect_free = True
+    return func
+
+
+def invalidates(*functions):
+    """
+    A decorator that has InquirerExecutor clear the cached return
+    values (see option_cache) of the given functions every time the
+    decorated function has been executed.
+    """
+
+    def invalidates_wrap(func):
+        func._invalidates = functions
+        return func
+
+    return invalidates_wrap
+
+
+def invalidate(*functions):
+    """
+    Clears the cached return values (see option_cache) of the
+    given functions.
+    """
+    for function in functions:
+        cache = getattr(function, "_result_cache", None)
+        if cache is not None:
+            cache.clear()
+
+
+def _label(function):
+    """
+    Returns the docstring an option is displayed with, rendering
+    the docstring set by dynamic_docstring_decorator the first
+    time it is needed.
+    """
+    lazy_docstring = getattr(function, "_lazy_docstring", None)
+    if lazy_docstring is None:
+        return function.__doc__
+    docstring, args, kwargs = lazy_docstring
+    if callable(docstring):
+        docstring = docstring(*args, **kwargs)
+    else:
+        docstring = docstring.format(*args, **kwargs)
+    # Writing the rendered docstring through, so it is rendered only once
+    function = getattr(function, "__func__", function)
+    function.__doc__ = docstring
+    function._lazy_docstring = None
+    return docstring
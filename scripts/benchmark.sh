@@ -0,0 +1 @@
+python3 benchmarks/benchmark.py --output benchmark_results.json
\ No newline at end of file
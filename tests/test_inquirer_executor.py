@@ -1,19 +1,55 @@
+import asyncio
+import io
+import json
 import os
+import subprocess
 import sys
+import tempfile
+import threading
+import time
+import tracemalloc
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from unittest.mock import patch
 from readchar import key
 from copy import deepcopy
+from functools import wraps
+from itertools import islice
 from inquirer import List, Checkbox, Text
 
 sys.path.append(os.path.realpath("."))
 from inquirer_executor import (
     InquirerExecutorBase as Base,
     InquirerExecutorList as InqExList,
+    InquirerExecutorPagedList as InqExPagedList,
     InquirerExecutorCheckbox as InqExCheckbox,
     QuestionsCatalogue,
+    MenuRegistry,
+    ExecutionError,
+    TimedOut,
+    AnswerProvider,
+    PromptBackend,
+    AnsiBackend,
+    FakeBackend,
+    set_backend,
+    SessionRecorder,
+    SessionReplayer,
+    LatencyHistogram,
+    JsonlEventWriter,
+    add_observer,
+    remove_observer,
     dynamic_docstring_decorator,
+    option_timeout,
+    option_cache,
+    side_effect_free,
+    depends_on,
+    uses_resources,
+    invalidates,
+    invalidate,
 )
-
+from inquirer_executor.inquirer_executor import _signature_cache
+from benchmarks import benchmark
 
 class TestInquirerExecutorList(unittest.TestCase):
     """
@@ -73,6 +109,46 @@ class TestInquirerExecutorList(unittest.TestCase):
         with self.assertRaises(AssertionError):
             failing_inqex = InqExList.from_iterable("Anything?", [one_arg, two_args])
 
+    def test_arg_consistency_of_keywords_and_varargs(self):
+        def keyword_only(*, anything):
+            return anything
+
+        def positional(anything):
+            return anything
+
+        def varargs(*anything):
+            return anything
+
+        with self.assertRaises(AssertionError):
+            InqExList("Anything?", [keyword_only, positional])
+
+        with self.assertRaises(AssertionError):
+            InqExList("Anything?", [varargs, positional])
+
+    def test_arg_consistency_of_methods(self):
+        class Record:
+            def inspect(self):
+                """Inspect"""
+                return self
+
+        def go_back():
+            """Go back"""
+            pass
+
+        # Bound methods are compared by the parameters they accept when called
+        records = [Record() for _ in range(3)]
+        new_inqex = InqExList("What?", [record.inspect for record in records])
+        new_inqex += go_back
+        self.assertEqual(len(new_inqex._options), 4)
+
+        # All bound methods share one cached fingerprint
+        cached = [
+            key
+            for key in _signature_cache
+            if key[0] is Record.inspect.__code__ and key[1]
+        ]
+        self.assertEqual(len(cached), 1)
+
     def test_iterating(self):
         l = []
         for f in self.inqex:
@@ -174,6 +250,146 @@ class TestInquirerExecutorList(unittest.TestCase):
         self.assertListEqual(inqex_copy._options, [self.inqex[2]])
         self.assertEqual(len(inqex_copy._question[0].choices), 1)
 
+    def test_extending(self):
+        inqex_copy = deepcopy(self.inqex)
+
+        def returns_two():
+            """Return 2"""
+            return 2
+
+        def returns_three():
+            """Return 3"""
+            return 3
+
+        def failing_due_to_unwanted_argument(argument):
+            return argument
+
+        # Generators are fine, too
+        inqex_copy.extend(f for f in (returns_two, returns_three))
+        self.assertListEqual(inqex_copy._options[-2:], [returns_two, returns_three])
+        self.assertEqual(inqex_copy._question[0].choices[-1], "Return 3")
+
+        options = list(inqex_copy._options)
+        with self.assertRaises(AssertionError):
+            inqex_copy.extend([returns_two, failing_due_to_unwanted_argument])
+        with self.assertRaises(TypeError):
+            inqex_copy.extend([returns_two, "something that isn't a callable type"])
+        # Nothing is added if a single function doesn't fit
+        self.assertListEqual(inqex_copy._options, options)
+
+    def test_replacing_all(self):
+        inqex_copy = deepcopy(self.inqex)
+
+        def takes_an_argument(argument):
+            """Take an argument"""
+            return argument
+
+        def takes_another_argument(argument):
+            return argument
+
+        def takes_no_argument():
+            return None
+
+        options = list(inqex_copy._options)
+        with self.assertRaises(AssertionError):
+            inqex_copy.replace_all([takes_an_argument, takes_no_argument])
+        self.assertListEqual(inqex_copy._options, options)
+        # The old options still determine the parameters after a failure
+        with self.assertRaises(AssertionError):
+            inqex_copy += takes_an_argument
+
+        # The new options may take different parameters than the old ones
+        inqex_copy.replace_all([takes_an_argument, takes_another_argument])
+        self.assertListEqual(
+            inqex_copy._options, [takes_an_argument, takes_another_argument]
+        )
+        self.assertEqual(inqex_copy._question[0].choices[0], "Take an argument")
+        with self.assertRaises(AssertionError):
+            inqex_copy += takes_no_argument
+
+    def test_reordering_validation(self):
+        inqex_copy = deepcopy(self.inqex)
+
+        with self.assertRaises(ValueError):
+            inqex_copy.reorder([1, 0])
+        with self.assertRaises(ValueError):
+            inqex_copy.reorder([0, 0, 1])
+        with self.assertRaises(ValueError):
+            inqex_copy.reorder([0, 1, 3])
+        with self.assertRaises(ValueError):
+            inqex_copy.reorder([0, 1, "2"])
+        self.assertListEqual(inqex_copy._options, self.inqex._options)
+
+    def test_removing_many(self):
+        inqex_copy = deepcopy(self.inqex)
+
+        with self.assertRaises(ValueError):
+            inqex_copy.remove_many([["this", "and", "that"]])
+        with self.assertRaises(IndexError):
+            inqex_copy.remove_many([0, 3])
+        self.assertListEqual(inqex_copy._options, self.inqex._options)
+
+        # removing by function names and indices at once
+        inqex_copy.remove_many(["return_one", -1])
+        self.assertListEqual(inqex_copy._options, [self.inqex[1]])
+        self.assertEqual(len(inqex_copy._question[0].choices), 1)
+
+        # removing by predicate
+        inqex_copy = deepcopy(self.inqex)
+        inqex_copy.remove_many(lambda function: function() is True)
+        self.assertListEqual(inqex_copy._options, [self.inqex[0], self.inqex[1]])
+        self.assertEqual(len(inqex_copy._question[0].choices), 2)
+
+        # removing every option of the same name
+        inqex_copy.extend([self.inqex[0]] * 3)
+        inqex_copy.remove_many("return_one")
+        self.assertListEqual(inqex_copy._options, [self.inqex[1]])
+
+    def test_lazy_question(self):
+        inqex_copy = deepcopy(self.inqex)
+
+        def returns_two():
+            """Return 2"""
+            return 2
+
+        inqex_copy += returns_two
+        inqex_copy.reverse()
+        # Mutations don't rebuild the question, accessing it does
+        self.assertIsNone(inqex_copy._cached_question)
+        self.assertEqual(inqex_copy._question[0].choices[0], "Return 2")
+        self.assertIs(inqex_copy._question, inqex_copy._question)
+
+    def test_batch(self):
+        inqex_copy = deepcopy(self.inqex)
+
+        def returns_two():
+            """Return 2"""
+            return 2
+
+        def failing_due_to_unwanted_argument(argument):
+            return argument
+
+        with inqex_copy.batch():
+            inqex_copy += returns_two
+            # Checking is deferred, so this is fine as long as it's gone at the end
+            inqex_copy.insert(0, failing_due_to_unwanted_argument)
+            inqex_copy.remove("failing_due_to_unwanted_argument")
+        self.assertEqual(len(inqex_copy._options), 4)
+        self.assertEqual(inqex_copy._question[0].choices[-1], "Return 2")
+
+        options = list(inqex_copy._options)
+        with self.assertRaises(AssertionError):
+            with inqex_copy.batch():
+                inqex_copy.reverse()
+                inqex_copy += failing_due_to_unwanted_argument
+        # A failed batch leaves the options untouched
+        self.assertListEqual(inqex_copy._options, options)
+        self.assertEqual(len(inqex_copy._question[0].choices), 4)
+
+        with self.assertRaises(TypeError):
+            with inqex_copy.batch():
+                inqex_copy += "something that isn't a callable type"
+
     def test_prompting(self):
         """
         Prompting is already being sufficiently tested in
@@ -189,6 +405,51 @@ class TestInquirerExecutorList(unittest.TestCase):
         inqex_copy.answer = 'Return "a string" '
         self.assertEqual(inqex_copy.find_function(), self.inqex[1])
 
+    def test_finding_functions_after_mutating(self):
+        inqex_copy = deepcopy(self.inqex)
+
+        def returns_two():
+            """Return 2"""
+            return 2
+
+        def returns_three():
+            """Return 3"""
+            return 3
+
+        inqex_copy += returns_two
+        inqex_copy.insert(0, returns_three)
+        inqex_copy.answer = "Return 2"
+        self.assertIs(inqex_copy.find_function(), returns_two)
+        inqex_copy.answer = "Return 3"
+        self.assertIs(inqex_copy.find_function(), returns_three)
+
+        inqex_copy.remove("returns_three")
+        self.assertIsNone(inqex_copy.find_function())
+
+        inqex_copy[0] = returns_three
+        self.assertIs(inqex_copy.find_function(), returns_three)
+        inqex_copy.answer = "Return 1"
+        self.assertIsNone(inqex_copy.find_function())
+
+    def test_finding_functions_with_duplicate_docstrings(self):
+        def first():
+            """Duplicate"""
+            return "first"
+
+        def second():
+            """Duplicate"""
+            return "second"
+
+        inqex = InqExList("Which one?", [first, second])
+        inqex.answer = "Duplicate"
+        self.assertIs(inqex.find_function(), first)
+
+        # The first option in the current order always wins
+        inqex.reverse()
+        self.assertIs(inqex.find_function(), second)
+        inqex.reorder([1, 0])
+        self.assertIs(inqex.find_function(), first)
+
     def test_executing(self):
         inqex_copy = deepcopy(self.inqex)
 
@@ -199,6 +460,319 @@ class TestInquirerExecutorList(unittest.TestCase):
         self.assertEqual(inqex_copy.execute(), "a string")
 
 
+class TestMemoryFootprint(unittest.TestCase):
+    def setUp(self):
+        def edit():
+            """Edit the record"""
+
+        def delete():
+            """Delete the record"""
+
+        self.fs = [edit, delete]
+
+    def test_slots(self):
+        for inqex in (
+            InqExList("Which one?", self.fs),
+            InqExPagedList("Which one?", self.fs),
+            InqExCheckbox("Which ones?", self.fs),
+        ):
+            self.assertFalse(hasattr(inqex, "__dict__"))
+
+    def test_sharing_choices(self):
+        first = InqExList("Which one?", self.fs)
+        second = InqExCheckbox("Which ones?", list(self.fs))
+        self.assertIs(first._choices(), second._choices())
+        self.assertIs(first._index, second._index)
+        # Mutating one of them leaves the other one alone
+        second.reverse()
+        self.assertEqual(second._choices(), ("Delete the record", "Edit the record"))
+        self.assertEqual(first._choices(), ("Edit the record", "Delete the record"))
+
+        # Changed docstrings aren't taken from a table built before
+        self.fs[0].__doc__ = "Change the record"
+        third = InqExList("Which one?", self.fs)
+        self.assertEqual(third._choices(), ("Change the record", "Delete the record"))
+
+    def test_building_choices_while_building_choices(self):
+        def label():
+            # Labels may be rendered from other menus
+            return "Edit " + InqExList("Which one?", self.fs[1:])._choices()[0]
+
+        edit = dynamic_docstring_decorator(label)(self.fs[0])
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(InqExList("Which one?", [edit])._choices()),
+            daemon=True,
+        )
+        thread.start()
+        thread.join(5)
+        self.assertListEqual(result, [("Edit Delete the record",)])
+
+    def test_memory_per_instance(self):
+        count = 10000
+        tracemalloc.start()
+        try:
+            started = tracemalloc.take_snapshot()
+            inqexes = [InqExList("Which one?", self.fs) for _ in range(count)]
+            for inqex in inqexes:
+                inqex.answer = "Edit the record"
+                inqex.find_function()
+            finished = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        allocated = sum(
+            stat.size_diff for stat in finished.compare_to(started, "filename")
+        )
+        # With a __dict__ and a docstring index of their own, this
+        # used to be more than 800 bytes per instance
+        self.assertLess(allocated / count, 300)
+
+
+class TestCachedMenus(unittest.TestCase):
+    def setUp(self):
+        def attack(monster):
+            """Attack"""
+            return "attack"
+
+        def flee(monster):
+            """Flee"""
+            return "flee"
+
+        def hide(monster):
+            """Hide"""
+            return "hide"
+
+        self.fs = [attack, flee, hide]
+        self.registry = MenuRegistry(maxsize=2)
+
+    def test_reusing_menus(self):
+        inqex = InqExList.cached("What do you do?", self.fs[:2], registry=self.registry)
+        inqex.answer = "Flee"
+        self.assertIs(
+            InqExList.cached("What do you do?", self.fs[:2], registry=self.registry),
+            inqex,
+        )
+        # The answer of the last time doesn't stick around
+        self.assertIsNone(inqex.answer)
+
+        # Different options, arguments or classes make a different menu
+        self.assertIsNot(
+            InqExList.cached("What do you do?", self.fs, registry=self.registry), inqex
+        )
+        checkbox = InqExCheckbox.cached(
+            "What do you do?", self.fs[:2], registry=self.registry, executor="thread"
+        )
+        self.assertIsInstance(checkbox, InqExCheckbox)
+        self.assertEqual(checkbox.executor, "thread")
+        self.assertIsNot(
+            InqExCheckbox.cached(
+                "What do you do?", self.fs[:2], registry=self.registry
+            ),
+            checkbox,
+        )
+
+    def test_dropping_least_recently_used(self):
+        first = InqExList.cached("First?", self.fs, registry=self.registry)
+        second = InqExList.cached("Second?", self.fs, registry=self.registry)
+        self.assertIs(
+            InqExList.cached("First?", self.fs, registry=self.registry), first
+        )
+        InqExList.cached("Third?", self.fs, registry=self.registry)
+        self.assertEqual(len(self.registry), 2)
+        self.assertIs(
+            InqExList.cached("First?", self.fs, registry=self.registry), first
+        )
+        self.assertIsNot(
+            InqExList.cached("Second?", self.fs, registry=self.registry), second
+        )
+
+        self.registry.clear()
+        self.assertEqual(len(self.registry), 0)
+
+    def test_unhashable_arguments(self):
+        class Spell:
+            """Cast a spell"""
+
+            __hash__ = None
+
+            def __call__(self, monster):
+                return "spell"
+
+        fs = self.fs + [Spell()]
+        inqex = InqExList.cached("What do you do?", fs, registry=self.registry)
+        self.assertIsNot(
+            InqExList.cached("What do you do?", fs, registry=self.registry), inqex
+        )
+        self.assertEqual(len(self.registry), 0)
+
+
+class TestInquirerExecutorFilterableList(unittest.TestCase):
+    def setUp(self):
+        def make_function(name):
+            def function():
+                return name
+
+            function.__doc__ = "Call {}".format(name)
+            return function
+
+        self.names = ["Ada Lovelace", "Linus Torvalds", "Guido van Rossum", "Adam"]
+        self.inqex = InqExList(
+            "Who?", [make_function(name) for name in self.names], filterable=True
+        )
+
+    def test_filtering(self):
+        self.assertListEqual(
+            self.inqex.filter("ADA"), ["Call Ada Lovelace", "Call Adam"]
+        )
+        self.assertListEqual(self.inqex.filter("van ross"), ["Call Guido van Rossum"])
+        self.assertListEqual(
+            self.inqex.filter("s"), ["Call Linus Torvalds", "Call Guido van Rossum"]
+        )
+        self.assertListEqual(self.inqex.filter("Rossum Guido"), [])
+        self.assertEqual(len(self.inqex.filter("")), 4)
+
+        def bjarne():
+            """Call Bjarne Stroustrup"""
+            return "Bjarne Stroustrup"
+
+        # The index is rebuilt after mutating
+        self.inqex += bjarne
+        self.assertListEqual(self.inqex.filter("strou"), ["Call Bjarne Stroustrup"])
+
+    def test_prompting_filtered(self):
+        calls = []
+
+        def fake_prompt(questions, **kwargs):
+            calls.append(questions[0])
+            if isinstance(questions[0], Text):
+                # Nothing matches the first search term
+                return {"search_term": "ada" if len(calls) > 1 else "bjarne"}
+            return {"omittet": questions[0].choices[-1]}
+
+        with patch("inquirer_executor.inquirer_executor.prompt", fake_prompt):
+            self.assertEqual(self.inqex.prompt_and_execute(), "Adam")
+        self.assertListEqual(calls[2].choices, ["Call Ada Lovelace", "Call Adam"])
+
+
+class TestInquirerExecutorPagedList(unittest.TestCase):
+    def setUp(self):
+        self.produced = []
+
+        def make_function(number):
+            self.produced.append(number)
+
+            def return_number():
+                return number
+
+            return_number.__doc__ = "Return {}".format(number)
+            return return_number
+
+        self.make_function = make_function
+
+    def test_paging_a_sequence(self):
+        inqex = InqExPagedList(
+            "Which one?", range(100000), page_size=10, factory=self.make_function
+        )
+        # Only the rows of the first page are turned into functions
+        self.assertListEqual(self.produced, list(range(10)))
+        self.assertEqual(len(inqex._options), 10)
+        choices = inqex._question[0].choices
+        self.assertEqual(choices[-1], InqExPagedList.next_page_label)
+        self.assertNotIn(InqExPagedList.previous_page_label, choices)
+
+        answers = AnswerProvider(
+            [
+                InqExPagedList.next_page_label,
+                InqExPagedList.next_page_label,
+                "Return 25",
+            ]
+        )
+        self.assertEqual(inqex.prompt_and_execute(_answers=answers), 25)
+        self.assertEqual(inqex.page, 2)
+        self.assertEqual(len(self.produced), 30)
+        self.assertEqual(
+            inqex._question[0].choices[0], InqExPagedList.previous_page_label
+        )
+
+    def test_paging_a_generator(self):
+        consumed = []
+
+        def rows():
+            for number in range(25):
+                consumed.append(number)
+                yield number
+
+        inqex = InqExPagedList(
+            "Which one?", rows(), page_size=10, factory=self.make_function
+        )
+        self.assertEqual(len(consumed), 10)
+        # One row more than shown is read, to know whether there's a next page
+        self.assertEqual(inqex._question[0].choices[-1], InqExPagedList.next_page_label)
+        self.assertEqual(len(consumed), 11)
+
+        # Answers not on the current page are looked for on the others
+        self.assertEqual(
+            inqex.prompt_and_execute(_answers={"Which one?": "Return 21"}), 21
+        )
+        self.assertEqual(inqex.page, 2)
+        self.assertNotIn(InqExPagedList.next_page_label, inqex._question[0].choices)
+        self.assertEqual(
+            inqex.prompt_and_execute(_answers={"Which one?": "Return 3"}), 3
+        )
+        self.assertEqual(inqex.page, 0)
+
+        with self.assertRaises(ValueError):
+            inqex.prompt_user(answers={"Which one?": "Return 30"})
+        self.assertEqual(inqex.page, 0)
+
+    def test_paging_with_a_list_of_answers(self):
+        inqex = InqExPagedList(
+            "Which one?", range(100), page_size=10, factory=self.make_function
+        )
+        answers = [InqExPagedList.next_page_label, "Return 12"]
+        self.assertEqual(inqex.prompt_and_execute(_answers=answers), 12)
+        self.assertEqual(inqex.page, 1)
+
+    def test_bounding_the_search_for_answers(self):
+        consumed = []
+
+        def rows():
+            for number in range(200000):
+                consumed.append(number)
+                yield number
+
+        inqex = InqExPagedList(
+            "Which one?",
+            rows(),
+            page_size=10,
+            factory=self.make_function,
+            search_pages=2,
+        )
+        with self.assertRaises(ValueError):
+            inqex.prompt_user(answers={"Which one?": "Return 100000"})
+        # Only the page read already and two more have been searched
+        self.assertLessEqual(len(consumed), 31)
+        self.assertEqual(inqex.page, 0)
+        self.assertEqual(
+            inqex.prompt_and_execute(_answers={"Which one?": "Return 35"}), 35
+        )
+
+    def test_mutating(self):
+        inqex = InqExPagedList("Which one?", [self.make_function(1)])
+
+        with self.assertRaises(TypeError):
+            inqex += self.make_function(2)
+
+        with self.assertRaises(TypeError):
+            inqex.remove(0)
+
+        with self.assertRaises(TypeError):
+            inqex.extend([self.make_function(2)])
+
+        with self.assertRaises(TypeError):
+            inqex.remove_many([0])
+
+
 class TestInquirerExecutorCheckbox(unittest.TestCase):
     """
     These tests test for properties and functionality of 
@@ -241,6 +815,23 @@ class TestInquirerExecutorCheckbox(unittest.TestCase):
         inqex_copy.answer = ['Return "a string" ', "Return boolean value True"]
         self.assertEqual(inqex_copy.find_functions(), [self.inqex[1], self.inqex[2]])
 
+    def test_finding_functions_keeps_option_order_and_duplicates(self):
+        def first():
+            """Duplicate"""
+            return "first"
+
+        def second():
+            """Duplicate"""
+            return "second"
+
+        inqex_copy = deepcopy(self.inqex)
+        inqex_copy += [first, second]
+        # The order of the answer does not matter, the order of the options does
+        inqex_copy.answer = ["Duplicate", "Return 1"]
+        self.assertEqual(
+            inqex_copy.find_functions(), [inqex_copy[0], inqex_copy[3], inqex_copy[4]]
+        )
+
     def test_executing(self):
         inqex_copy = deepcopy(self.inqex)
 
@@ -253,6 +844,587 @@ class TestInquirerExecutorCheckbox(unittest.TestCase):
             self.assertIn(result, ["a string", True])
 
 
+class TestInquirerExecutorCheckboxConcurrently(unittest.TestCase):
+    def setUp(self):
+        # Every function waits for all others to be running,
+        # which can only succeed if they run concurrently.
+        self.barrier = threading.Barrier(3, timeout=5)
+
+        def return_one():
+            """Return 1"""
+            self.barrier.wait()
+            return 1
+
+        def return_two():
+            """Return 2"""
+            self.barrier.wait()
+            return 2
+
+        def return_three():
+            """Return 3"""
+            self.barrier.wait()
+            return 3
+
+        self.fs = [return_one, return_two, return_three]
+
+    def test_invalid_executor(self):
+        with self.assertRaises(ValueError):
+            InqExCheckbox("What?", self.fs, executor="fibers")
+
+    def test_executing_in_threads(self):
+        inqex = InqExCheckbox("What?", self.fs, executor="thread", max_workers=3)
+        inqex.answer = ["Return 3", "Return 1", "Return 2"]
+        inqex.find_functions()
+        # Results are in the order of the options, not of completion
+        self.assertListEqual(inqex.execute(), [1, 2, 3])
+
+    def test_executing_with_executor_instance(self):
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            inqex = InqExCheckbox.from_iterable("What?", self.fs, executor=pool)
+            inqex.answer = ["Return 1", "Return 2", "Return 3"]
+            inqex.find_functions()
+            self.assertListEqual(inqex.execute(), [1, 2, 3])
+            # The passed in executor is not shut down
+            self.assertEqual(pool.submit(int, "4").result(), 4)
+
+    def test_collecting_errors(self):
+        def fail():
+            """Fail"""
+            self.barrier.wait()
+            raise RuntimeError("failed")
+
+        inqex = InqExCheckbox("What?", self.fs[:2] + [fail], executor="thread")
+        inqex.answer = ["Return 1", "Return 2", "Fail"]
+        inqex.find_functions()
+        with self.assertRaises(ExecutionError) as context:
+            inqex.execute()
+        self.assertListEqual(context.exception.results, [1, 2, None])
+        self.assertEqual(len(context.exception.errors), 1)
+        function, exception = context.exception.errors[0]
+        self.assertIs(function, fail)
+        self.assertIsInstance(exception, RuntimeError)
+
+
+class TestInquirerExecutorCheckboxStreaming(unittest.TestCase):
+    def setUp(self):
+        self.started = threading.Event()
+        self.finished = threading.Event()
+        self.called = []
+
+        def slow():
+            """Slow"""
+            self.called.append("slow")
+            self.started.set()
+            # Only finishes once the test lets it
+            self.assertTrue(self.finished.wait(5))
+            return "slow"
+
+        def fast():
+            """Fast"""
+            self.called.append("fast")
+            return "fast"
+
+        def fail():
+            """Fail"""
+            self.called.append("fail")
+            raise RuntimeError("failed")
+
+        self.fs = [slow, fast, fail]
+
+    def test_streaming_sequentially(self):
+        inqex = InqExCheckbox("What?", self.fs[1:] + self.fs[:1])
+        inqex.answer = ["Fast", "Fail", "Slow"]
+        inqex.find_functions()
+        results = inqex.iter_execute()
+        function, result = next(results)
+        self.assertEqual((function.__name__, result), ("fast", "fast"))
+        # Nothing runs before the next result is asked for
+        self.assertEqual(self.called, ["fast"])
+        function, result = next(results)
+        self.assertEqual(function.__name__, "fail")
+        self.assertIsInstance(result, RuntimeError)
+        self.finished.set()
+        self.assertEqual([(f.__name__, r) for f, r in results], [("slow", "slow")])
+
+    def test_streaming_in_completion_order(self):
+        inqex = InqExCheckbox("What?", self.fs, executor="thread", max_workers=3)
+        inqex.answer = ["Slow", "Fast", "Fail"]
+        inqex.find_functions()
+        results = inqex.iter_execute()
+        # The slow one is the first one to be started, but it can't
+        # finish before the other ones have been handed out
+        names = [function.__name__ for function, _ in islice(results, 2)]
+        self.finished.set()
+        self.assertEqual(sorted(names), ["fail", "fast"])
+        self.assertEqual([(f.__name__, r) for f, r in results], [("slow", "slow")])
+
+    def test_stopping_early(self):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # The slow one blocks the only worker, so the fast one
+            # can't be started before the iteration is stopped
+            inqex = InqExCheckbox(
+                "What?", self.fs[::-1][:1] + self.fs[:2], executor=pool
+            )
+            inqex.answer = ["Fail", "Slow", "Fast"]
+            inqex.find_functions()
+            results = inqex.iter_execute()
+            function, result = next(results)
+            self.assertEqual(function.__name__, "fail")
+            self.assertTrue(self.started.wait(5))
+            results.close()
+            self.finished.set()
+        self.assertEqual(self.called, ["fail", "slow"])
+
+    def test_without_answer(self):
+        with self.assertRaises(ValueError):
+            InqExCheckbox("What?", self.fs).iter_execute()
+
+
+class TestTimeouts(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.called = []
+
+        def hang():
+            """Hang"""
+            self.called.append("hang")
+            self.release.wait(5)
+            return "hang"
+
+        def return_one():
+            """Return 1"""
+            self.called.append("return_one")
+            return 1
+
+        self.fs = [hang, return_one]
+
+    def tearDown(self):
+        self.release.set()
+
+    def test_timing_out_list(self):
+        inqex = InqExList("What?", self.fs)
+        inqex.answer = "Hang"
+        result = inqex.execute(_timeout=0.05)
+        self.assertIsInstance(result, TimedOut)
+        self.assertFalse(result)
+        self.assertIs(result.function, self.fs[0])
+        self.assertEqual(result.timeout, 0.05)
+
+        inqex.answer = "Return 1"
+        self.assertEqual(inqex.execute(_timeout=1), 1)
+
+    def test_passing_timeout_arguments(self):
+        def fetch(timeout=None):
+            """Fetch"""
+            return timeout
+
+        # Options may take a timeout of their own
+        inqex = InqExList("What?", [fetch])
+        inqex.answer = "Fetch"
+        self.assertEqual(inqex.execute(timeout=5), 5)
+        self.assertEqual(inqex.execute(timeout=5, _timeout=1), 5)
+
+    def test_choosing_timeouts(self):
+        option_timeout(0.05)(self.fs[0])
+        inqex = InqExList("What?", self.fs, timeout=10)
+        self.assertEqual(inqex._timeout_for(self.fs[0]), 0.05)
+        self.assertEqual(inqex._timeout_for(self.fs[1]), 10)
+        self.assertEqual(inqex._timeout_for(self.fs[0], 1), 1)
+        inqex.answer = "Hang"
+        self.assertEqual(inqex.execute().timeout, 0.05)
+
+    def test_raising_within_timeout(self):
+        def fail():
+            """Fail"""
+            raise RuntimeError("failed")
+
+        inqex = InqExList("What?", [fail], timeout=1)
+        inqex.answer = "Fail"
+        with self.assertRaises(RuntimeError):
+            inqex.execute()
+
+    def test_timing_out_checkbox(self):
+        inqex = InqExCheckbox("What?", self.fs, timeout=0.05)
+        inqex.answer = ["Hang", "Return 1"]
+        inqex.find_functions()
+        hung, one = inqex.execute()
+        self.assertIsInstance(hung, TimedOut)
+        self.assertEqual(one, 1)
+
+    def test_timing_out_concurrently(self):
+        inqex = InqExCheckbox("What?", self.fs, executor="thread")
+        inqex.answer = ["Hang", "Return 1"]
+        inqex.find_functions()
+        hung, one = inqex.execute(_timeout=0.05)
+        self.assertIsInstance(hung, TimedOut)
+        self.assertEqual(one, 1)
+
+        results = dict(inqex.iter_execute(_timeout=0.05))
+        self.assertIsInstance(results[self.fs[0]], TimedOut)
+        self.assertEqual(results[self.fs[1]], 1)
+
+    def test_timing_out_waiting_for_workers(self):
+        def make_function(name):
+            def function():
+                time.sleep(0.2)
+                return name
+
+            function.__doc__ = name
+            return function
+
+        fs = [make_function("a"), make_function("b")]
+        # The second function waits for the worker longer than its
+        # timeout, which only counts once it has been started
+        inqex = InqExCheckbox(
+            "What?", fs, executor="thread", max_workers=1, timeout=0.3
+        )
+        inqex.answer = ["a", "b"]
+        inqex.find_functions()
+        self.assertListEqual(inqex.execute(), ["a", "b"])
+        self.assertDictEqual(dict(inqex.iter_execute()), {fs[0]: "a", fs[1]: "b"})
+
+        questions_catalogue = QuestionsCatalogue(
+            [], executor="thread", max_workers=1, timeout=0.3
+        )
+        questions_catalogue.execution_stack = fs
+        self.assertListEqual(questions_catalogue.execute(), ["a", "b"])
+
+    def test_interrupting(self):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            inqex = InqExCheckbox("What?", self.fs, executor=pool, timeout=5)
+            inqex.answer = ["Hang", "Return 1"]
+            inqex.find_functions()
+            with patch("concurrent.futures.wait", side_effect=KeyboardInterrupt):
+                with self.assertRaises(KeyboardInterrupt):
+                    inqex.execute()
+            self.release.set()
+        # The function waiting for the hung one to finish was cancelled
+        self.assertEqual(self.called, ["hang"])
+
+    def test_timing_out_async(self):
+        async def hang():
+            """Hang"""
+            await asyncio.sleep(5)
+
+        inqex = InqExCheckbox("What?", [hang], timeout=0.05)
+        inqex.answer = ["Hang"]
+        inqex.find_functions()
+        (result,) = asyncio.run(inqex.async_execute())
+        self.assertIsInstance(result, TimedOut)
+
+
+class TestCachingResults(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.contacts = ["Ada", "Grace"]
+
+        @option_cache()
+        def list_contacts(prefix=""):
+            """List contacts"""
+            self.calls.append(prefix)
+            return [prefix + contact for contact in self.contacts]
+
+        @invalidates(list_contacts)
+        def delete_contact(prefix=""):
+            """Delete contact"""
+            self.contacts.pop()
+
+        self.list_contacts = list_contacts
+        self.delete_contact = delete_contact
+        self.inqex = InqExList("What?", [list_contacts, delete_contact])
+
+    def test_caching_results(self):
+        events = []
+        self.inqex.add_observer(lambda event: events.append(event.kind))
+        for _ in range(3):
+            self.assertEqual(
+                self.inqex.prompt_and_execute(_answers=["List contacts"]),
+                ["Ada", "Grace"],
+            )
+        self.assertEqual(self.calls, [""])
+        self.assertEqual(events.count("cache_hit"), 2)
+        self.assertEqual(events.count("execution_start"), 1)
+
+        # Different arguments, different results
+        self.inqex.answer = "List contacts"
+        self.assertEqual(self.inqex.execute("Dr. "), ["Dr. Ada", "Dr. Grace"])
+        self.assertEqual(self.inqex.execute(prefix="Dr. "), ["Dr. Ada", "Dr. Grace"])
+        self.assertEqual(self.calls, ["", "Dr. ", "Dr. "])
+
+    def test_invalidating(self):
+        self.inqex.answer = "List contacts"
+        self.inqex.execute()
+        self.inqex.answer = "Delete contact"
+        self.inqex.execute()
+        self.inqex.answer = "List contacts"
+        self.assertEqual(self.inqex.execute(), ["Ada"])
+        self.assertEqual(self.calls, ["", ""])
+
+        self.contacts.append("Hedy")
+        invalidate(self.list_contacts, self.delete_contact)
+        self.assertEqual(self.inqex.execute(), ["Ada", "Hedy"])
+
+    def test_expiring_results(self):
+        option_cache(ttl=0.05)(self.list_contacts)
+        self.inqex.answer = "List contacts"
+        self.inqex.execute()
+        self.inqex.execute()
+        time.sleep(0.1)
+        self.inqex.execute()
+        self.assertEqual(self.calls, ["", ""])
+
+    def test_dropping_least_recently_used(self):
+        option_cache(maxsize=1)(self.list_contacts)
+        self.inqex.answer = "List contacts"
+        for prefix in ["a", "b", "b", "a"]:
+            self.inqex.execute(prefix)
+        self.assertEqual(self.calls, ["a", "b", "a"])
+
+    def test_building_keys(self):
+        option_cache(key=lambda prefix="": prefix.strip())(self.list_contacts)
+        self.inqex.answer = "List contacts"
+        self.inqex.execute("Dr.")
+        self.assertEqual(self.inqex.execute("Dr. "), ["Dr.Ada", "Dr.Grace"])
+        self.assertEqual(self.calls, ["Dr."])
+
+        # Results for keys that can't be hashed aren't cached
+        option_cache(key=lambda prefix="": [prefix])(self.list_contacts)
+        self.inqex.execute()
+        self.inqex.execute()
+        self.assertEqual(self.calls, ["Dr.", "", ""])
+
+    def test_not_caching_errors(self):
+        @option_cache()
+        def fail():
+            """Fail"""
+            self.calls.append("fail")
+            raise RuntimeError("failed")
+
+        inqex = InqExList("What?", [fail])
+        inqex.answer = "Fail"
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                inqex.execute()
+        self.assertEqual(self.calls, ["fail", "fail"])
+
+    def test_caching_methods(self):
+        class Report:
+            def __init__(self, name):
+                self.name = name
+                self.generated = 0
+
+            @option_cache()
+            def generate(self):
+                """Generate"""
+                self.generated += 1
+                return self.name
+
+        first, second = Report("first"), Report("second")
+        for report in (first, second, first):
+            inqex = InqExList("What?", [report.generate])
+            inqex.answer = "Generate"
+            self.assertEqual(inqex.execute(), report.name)
+        self.assertEqual((first.generated, second.generated), (1, 1))
+
+        def labelled(method):
+            @wraps(method)
+            def wrapper():
+                return method()
+
+            wrapper.__doc__ = "Generate " + method.__self__.name
+            return wrapper
+
+        # Wrapped methods of different instances don't share results either
+        inqex = InqExList(
+            "What?", [labelled(first.generate), labelled(second.generate)]
+        )
+        for report in (first, second):
+            inqex.answer = "Generate " + report.name
+            self.assertEqual(inqex.execute(), report.name)
+
+    def test_caching_concurrently(self):
+        inqex = InqExCheckbox("What?", [self.list_contacts], executor="thread")
+        inqex.answer = ["List contacts"]
+        inqex.find_functions()
+        self.assertEqual(inqex.execute(), [["Ada", "Grace"]])
+        self.assertEqual(inqex.execute(), [["Ada", "Grace"]])
+        self.assertEqual(
+            [result for _, result in inqex.iter_execute()], [["Ada", "Grace"]]
+        )
+        self.assertEqual(asyncio.run(inqex.async_execute()), [["Ada", "Grace"]])
+        self.assertEqual(self.calls, [""])
+
+
+class TestSpeculativeExecution(unittest.TestCase):
+    class HighlightingBackend(PromptBackend):
+        # Highlights the given options before answering
+        def __init__(self, highlights, answer, started=None):
+            self.highlights = highlights
+            self.answer = answer
+            self.started = started
+
+        def prompt(self, executor, **kwargs):
+            for label in self.highlights:
+                executor._highlighted(label)
+            if self.started is not None:
+                # Making sure the user takes longer than the option
+                self.started.wait(5)
+            return self.answer
+
+    def setUp(self):
+        self.started = threading.Event()
+        self.threads = []
+
+        @side_effect_free
+        def report(name):
+            """Show the report"""
+            self.threads.append(threading.current_thread().name)
+            self.started.set()
+            return "Report for " + name
+
+        def delete(name):
+            """Delete the report"""
+            self.threads.append(threading.current_thread().name)
+            return "Deleted " + name
+
+        self.fs = [report, delete]
+
+    def use_backend(self, backend):
+        self.addCleanup(set_backend, set_backend(backend))
+
+    def test_speculating_on_highlighted_option(self):
+        inqex = InqExList("What?", self.fs, speculative=True)
+        self.use_backend(
+            self.HighlightingBackend(
+                ["Show the report"], "Show the report", self.started
+            )
+        )
+        self.assertEqual(inqex.prompt_and_execute("Ada"), "Report for Ada")
+        self.assertEqual(len(self.threads), 1)
+        self.assertTrue(self.threads[0].startswith("inquirer-executor-speculation"))
+
+    def test_speculating_on_option_chosen_most_often(self):
+        inqex = InqExList("What?", self.fs, speculative=True)
+        self.use_backend(FakeBackend(["Show the report", "Show the report"]))
+        inqex.prompt_and_execute("Ada")
+        self.assertEqual(self.threads, [threading.current_thread().name])
+        self.started.clear()
+        self.use_backend(self.HighlightingBackend([], "Show the report", self.started))
+        self.assertEqual(inqex.prompt_and_execute("Ada"), "Report for Ada")
+        self.assertEqual(len(self.threads), 2)
+        self.assertTrue(self.threads[1].startswith("inquirer-executor-speculation"))
+
+    def test_not_speculating_on_side_effects(self):
+        inqex = InqExList("What?", self.fs, speculative=True)
+        self.use_backend(
+            self.HighlightingBackend(["Delete the report"], "Delete the report")
+        )
+        self.assertEqual(inqex.prompt_and_execute("Ada"), "Deleted Ada")
+        self.assertEqual(self.threads, [threading.current_thread().name])
+
+        # Not speculative, not speculating
+        inqex = InqExList("What?", self.fs)
+        self.use_backend(
+            self.HighlightingBackend(["Show the report"], "Show the report")
+        )
+        inqex.prompt_and_execute("Ada")
+        self.assertEqual(self.threads[-1], threading.current_thread().name)
+
+    def test_throwing_away_results(self):
+        inqex = InqExList("What?", self.fs, speculative=True)
+        self.use_backend(
+            self.HighlightingBackend(
+                ["Show the report"], "Delete the report", self.started
+            )
+        )
+        self.assertEqual(inqex.prompt_and_execute("Ada"), "Deleted Ada")
+        self.assertEqual(self.threads[-1], threading.current_thread().name)
+        self.assertIsNone(inqex._speculation)
+
+    def test_retrying_failed_speculation(self):
+        attempts = []
+
+        @side_effect_free
+        def flaky():
+            """Flaky"""
+            attempts.append(threading.current_thread().name)
+            self.started.set()
+            if len(attempts) == 1:
+                raise RuntimeError("failed")
+            return "worked"
+
+        inqex = InqExList("What?", [flaky], speculative=True)
+        self.use_backend(self.HighlightingBackend(["Flaky"], "Flaky", self.started))
+        self.assertEqual(inqex.prompt_and_execute(), "worked")
+        self.assertEqual(attempts[-1], threading.current_thread().name)
+
+    def test_highlighting_with_ansi_backend(self):
+        inqex = InqExList("What?", self.fs[::-1], speculative=True)
+        keys = iter([key.DOWN, key.ENTER])
+
+        def readkey():
+            # Waiting for the highlighted option to start before answering
+            pressed = next(keys)
+            if pressed == key.ENTER:
+                self.started.wait(5)
+            return pressed
+
+        self.use_backend(AnsiBackend(stream=io.StringIO(), readkey=readkey))
+        self.assertEqual(inqex.prompt_and_execute("Ada"), "Report for Ada")
+        self.assertEqual(len(self.threads), 1)
+        self.assertTrue(self.threads[0].startswith("inquirer-executor-speculation"))
+
+
+class TestInquirerExecutorAsync(unittest.TestCase):
+    def setUp(self):
+        async def return_one():
+            """Return 1"""
+            await asyncio.sleep(0)
+            return 1
+
+        def return_two():
+            """Return 2"""
+            return 2
+
+        async def fail():
+            """Fail"""
+            raise RuntimeError("failed")
+
+        self.fs = [return_one, return_two, fail]
+
+    def test_executing_list(self):
+        inqex = InqExList("What?", self.fs)
+        inqex.answer = "Return 1"
+        self.assertEqual(asyncio.run(inqex.async_execute()), 1)
+        inqex.answer = "Return 2"
+        self.assertEqual(asyncio.run(inqex.async_execute()), 2)
+
+    def test_executing_checkbox(self):
+        inqex = InqExCheckbox("What?", self.fs)
+        inqex.answer = ["Return 1", "Return 2"]
+        inqex.find_functions()
+        self.assertListEqual(asyncio.run(inqex.async_execute()), [1, 2])
+
+        inqex.answer = ["Return 1", "Return 2", "Fail"]
+        inqex.find_functions()
+        with self.assertRaises(ExecutionError) as context:
+            asyncio.run(inqex.async_execute())
+        self.assertListEqual(context.exception.results, [1, 2, None])
+        self.assertIs(context.exception.errors[0][0], self.fs[2])
+
+    def test_prompting_off_the_event_loop(self):
+        threads = []
+
+        def fake_prompt(questions, **kwargs):
+            threads.append(threading.get_ident())
+            return {"omittet": "Return 1"}
+
+        inqex = InqExList("What?", self.fs)
+        with patch("inquirer_executor.inquirer_executor.prompt", fake_prompt):
+            self.assertEqual(asyncio.run(inqex.async_prompt_and_execute()), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+
 class TestQuestionsCatalogue(unittest.TestCase):
     def setUp(self):
         def return_one():
@@ -340,6 +1512,804 @@ class TestQuestionsCatalogue(unittest.TestCase):
         """
         pass
 
+    def test_prompting_coalesces_inquirer_questions(self):
+        calls = []
+
+        def fake_prompt(questions, **kwargs):
+            calls.append([question.name for question in questions])
+            if isinstance(questions[0], Checkbox):
+                return {"omittet": ["Return 1", "Return 2"]}
+            if isinstance(questions[0], List):
+                return {"omittet": "Return 4"}
+            return {question.name: question.name.upper() for question in questions}
+
+        questions_catalogue = QuestionsCatalogue(
+            [
+                self.text_question_first_name,
+                self.inqex_checkbox,
+                self.text_question_first_name,
+                self.text_question_last_name,
+                self.inqex_list,
+                self.text_question_last_name,
+            ]
+        )
+        with patch("inquirer_executor.inquirer_executor.prompt", fake_prompt):
+            answer_dict, execution_stack = questions_catalogue.prompt_all()
+
+        self.assertListEqual(
+            calls,
+            [
+                ["first_name"],
+                ["omittet"],
+                ["first_name", "last_name"],
+                ["omittet"],
+                ["last_name"],
+            ],
+        )
+        self.assertDictEqual(
+            answer_dict, {"first_name": "FIRST_NAME", "last_name": "LAST_NAME"}
+        )
+        self.assertListEqual(
+            execution_stack,
+            [self.inqex_checkbox[0], self.inqex_checkbox[1], self.inqex_list[1]],
+        )
+
+    def test_prompting_repeatedly(self):
+        answers = {
+            "What do you want to return?": ["Return 1"],
+            "first_name": "Bruce",
+            "last_name": "Wayne",
+        }
+        questions_catalogue = QuestionsCatalogue(
+            [
+                self.inqex_checkbox,
+                self.text_question_first_name,
+                self.text_question_last_name,
+            ]
+        )
+        answer_dict, execution_stack = questions_catalogue.prompt_all(answers=answers)
+        # Every run starts over instead of adding to the last one
+        self.assertEqual(
+            questions_catalogue.prompt_all(answers=answers),
+            ({"first_name": "Bruce", "last_name": "Wayne"}, [self.inqex_checkbox[0]]),
+        )
+        self.assertListEqual(execution_stack, [self.inqex_checkbox[0]])
+        self.assertEqual(len(answer_dict), 2)
+
+    def test_prompting_incrementally(self):
+        inqex_list = InqExList.from_iterable(
+            "Which one do you want to return?", list(self.inqex_list)
+        )
+        questions_catalogue = QuestionsCatalogue(
+            [self.text_question_first_name, self.inqex_checkbox, inqex_list]
+        )
+        backend = FakeBackend(
+            {
+                "first_name": "Bruce",
+                "What do you want to return?": ["Return 1", "Return 2"],
+                "Which one do you want to return?": "Return 4",
+            }
+        )
+        previous = set_backend(backend)
+        try:
+            questions = questions_catalogue.iter_prompt()
+            # Nothing is prompted before the first answer is asked for
+            self.assertListEqual(backend.prompted, [])
+            self.assertEqual(next(questions), (self.text_question_first_name, "Bruce"))
+            self.assertEqual(len(backend.prompted), 1)
+            self.assertEqual(
+                next(questions),
+                (self.inqex_checkbox, [self.inqex_checkbox[0], self.inqex_checkbox[1]]),
+            )
+            # Stopping early leaves the remaining questions unasked
+            questions.close()
+            self.assertEqual(len(backend.prompted), 2)
+            self.assertDictEqual(
+                questions_catalogue.answer_dict, {"first_name": "Bruce"}
+            )
+            self.assertListEqual(
+                questions_catalogue.execution_stack,
+                [self.inqex_checkbox[0], self.inqex_checkbox[1]],
+            )
+
+            # Every run starts over
+            answered = list(questions_catalogue.iter_prompt())
+        finally:
+            set_backend(previous)
+        self.assertEqual(len(answered), 3)
+        self.assertEqual(answered[2], (inqex_list, self.inqex_list[1]))
+        self.assertListEqual(
+            questions_catalogue.execution_stack,
+            [self.inqex_checkbox[0], self.inqex_checkbox[1], self.inqex_list[1]],
+        )
+
+    def test_skipping_questions_incrementally(self):
+        questions_catalogue = QuestionsCatalogue(
+            [
+                self.inqex_checkbox,
+                self.text_question_first_name,
+                self.text_question_last_name,
+            ]
+        )
+
+        def skip(question, answer_dict, execution_stack):
+            # Only asking for the last name if the first one was given
+            # and for the first name if something was checked
+            if question is self.text_question_last_name:
+                return "first_name" not in answer_dict
+            if question is self.text_question_first_name:
+                return not execution_stack
+
+        answers = {
+            "What do you want to return?": [],
+            "first_name": "Bruce",
+            "last_name": "Wayne",
+        }
+        answered = list(questions_catalogue.iter_prompt(answers=answers, skip=skip))
+        self.assertListEqual(answered, [(self.inqex_checkbox, [])])
+        self.assertDictEqual(questions_catalogue.answer_dict, {})
+
+        answers["What do you want to return?"] = ["Return 2"]
+        answered = list(questions_catalogue.iter_prompt(answers=answers, skip=skip))
+        self.assertListEqual(
+            [answer for _, answer in answered],
+            [[self.inqex_checkbox[1]], "Bruce", "Wayne"],
+        )
+        self.assertDictEqual(
+            questions_catalogue.answer_dict,
+            {"first_name": "Bruce", "last_name": "Wayne"},
+        )
+
+
+class TestQuestionsCatalogueExecution(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.lock = threading.Lock()
+        self.running = {}
+        self.most_running = {}
+
+        def track(name, tag=None):
+            # Records when the function starts and finishes and how many
+            # functions using the same tag run at once
+            with self.lock:
+                self.events.append(("start", name))
+                if tag is not None:
+                    self.running[tag] = self.running.get(tag, 0) + 1
+                    self.most_running[tag] = max(
+                        self.most_running.get(tag, 0), self.running[tag]
+                    )
+            time.sleep(0.02)
+            with self.lock:
+                self.events.append(("end", name))
+                if tag is not None:
+                    self.running[tag] -= 1
+
+        self.track = track
+
+    def catalogue(self, execution_stack, **kwargs):
+        questions_catalogue = QuestionsCatalogue([], **kwargs)
+        questions_catalogue.execution_stack = execution_stack
+        return questions_catalogue
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            QuestionsCatalogue([], executor="fibers")
+        with self.assertRaises(ValueError):
+            QuestionsCatalogue([], resource_limits={"database": 0})
+        with self.assertRaises(ValueError):
+            self.catalogue([]).execute()
+
+    def test_executing_in_order_of_dependencies(self):
+        def install():
+            self.track("install")
+            return "installed"
+
+        @depends_on(install)
+        def configure():
+            self.track("configure")
+            return "configured"
+
+        @depends_on(configure, install)
+        def start():
+            self.track("start")
+            return "started"
+
+        questions_catalogue = self.catalogue([start, configure, install])
+        # The results are in the order of the execution_stack
+        self.assertListEqual(
+            questions_catalogue.execute(), ["started", "configured", "installed"]
+        )
+        self.assertListEqual(
+            [name for kind, name in self.events if kind == "start"],
+            ["install", "configure", "start"],
+        )
+
+    def test_executing_concurrently(self):
+        # Both wait for each other to be running, which can only
+        # succeed if they run concurrently
+        barrier = threading.Barrier(2, timeout=5)
+
+        def download(*args, **kwargs):
+            barrier.wait()
+            self.track("download")
+            return 1
+
+        def compile(*args, **kwargs):
+            barrier.wait()
+            self.track("compile")
+            return 2
+
+        @depends_on(download, compile)
+        def package(*args, **kwargs):
+            self.track("package")
+            return args, kwargs
+
+        questions_catalogue = self.catalogue(
+            [package, download, compile], executor="thread", max_workers=4
+        )
+        self.assertListEqual(
+            questions_catalogue.execute("x", y=1), [(("x",), {"y": 1}), 1, 2]
+        )
+        # Packaging only started once both others had finished
+        self.assertEqual(self.events[-2], ("start", "package"))
+
+    def test_ignoring_dependencies_not_chosen(self):
+        def install():
+            raise AssertionError("install wasn't chosen")
+
+        @depends_on(install)
+        def configure():
+            return "configured"
+
+        questions_catalogue = self.catalogue([configure], executor="thread")
+        self.assertListEqual(questions_catalogue.execute(), ["configured"])
+
+    def test_limiting_resources(self):
+        def make_function(number, tag):
+            @uses_resources(tag)
+            def function():
+                self.track(number, tag)
+                return number
+
+            return function
+
+        functions = [make_function(number, "database") for number in range(6)]
+        functions += [make_function(number, "apt") for number in range(6, 9)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            questions_catalogue = self.catalogue(
+                functions, executor=pool, resource_limits={"database": 2}
+            )
+            self.assertListEqual(questions_catalogue.execute(), list(range(9)))
+        self.assertEqual(self.most_running["database"], 2)
+        # Resources without a limit are used by one function at a time
+        self.assertEqual(self.most_running["apt"], 1)
+
+    def test_skipping_dependents_of_failed_functions(self):
+        def install():
+            raise RuntimeError("failed")
+
+        @depends_on(install)
+        def configure():
+            return "configured"
+
+        @depends_on(configure)
+        def start():
+            return "started"
+
+        def independent():
+            return "independent"
+
+        for executor in (None, "thread"):
+            questions_catalogue = self.catalogue(
+                [start, configure, install, independent], executor=executor
+            )
+            with self.assertRaises(ExecutionError) as context:
+                questions_catalogue.execute()
+            self.assertListEqual(
+                context.exception.results, [None, None, None, "independent"]
+            )
+            self.assertListEqual(
+                [function for function, _ in context.exception.errors], [install]
+            )
+            self.assertListEqual(context.exception.skipped, [start, configure])
+
+    def test_skipping_dependents_of_timed_out_functions(self):
+        finish = threading.Event()
+
+        @option_timeout(0.05)
+        def install():
+            finish.wait(5)
+
+        @depends_on(install)
+        def configure():
+            return "configured"
+
+        questions_catalogue = self.catalogue([install, configure], executor="thread")
+        try:
+            with self.assertRaises(ExecutionError) as context:
+                questions_catalogue.execute()
+        finally:
+            finish.set()
+        self.assertIsInstance(context.exception.results[0], TimedOut)
+        self.assertListEqual(context.exception.errors, [])
+        self.assertListEqual(context.exception.skipped, [configure])
+
+    def test_releasing_resources_of_timed_out_functions(self):
+        finish = threading.Event()
+
+        @option_timeout(0.05)
+        @uses_resources("database")
+        def hang():
+            finish.wait(5)
+
+        @uses_resources("database")
+        def query():
+            return "queried"
+
+        questions_catalogue = self.catalogue([hang, query], executor="thread")
+        started = time.monotonic()
+        try:
+            hung, queried = questions_catalogue.execute()
+        finally:
+            finish.set()
+        # The query didn't wait for the hanging function to return
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertIsInstance(hung, TimedOut)
+        self.assertEqual(queried, "queried")
+
+    def test_cyclic_dependencies(self):
+        def first():
+            raise AssertionError("nothing should be executed")
+
+        @depends_on(first)
+        def second():
+            raise AssertionError("nothing should be executed")
+
+        first._depends_on = (second,)
+
+        with self.assertRaises(ValueError):
+            self.catalogue([first, second], executor="thread").execute()
+
+
+class TestAnswerProvider(unittest.TestCase):
+    def setUp(self):
+        def return_one():
+            """Return 1"""
+            return 1
+
+        def return_two():
+            """Return 2"""
+            return 2
+
+        self.fs = [return_one, return_two]
+        self.inqex_list = InqExList("Which one?", self.fs)
+        self.inqex_checkbox = InqExCheckbox("Which ones?", self.fs)
+        self.questions_catalogue = QuestionsCatalogue(
+            [
+                Text("name", message="What's your name"),
+                self.inqex_list,
+                self.inqex_checkbox,
+            ]
+        )
+        # Nothing in here is supposed to reach the terminal
+        patcher = patch(
+            "inquirer_executor.inquirer_executor.prompt",
+            side_effect=AssertionError("The user got prompted."),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_answers_from_dict(self):
+        answers = {"Which one?": "Return 2", "Which ones?": ["Return 2", "Return 1"]}
+        self.assertEqual(self.inqex_list.prompt_and_execute(_answers=answers), 2)
+        self.assertListEqual(
+            self.inqex_checkbox.prompt_and_execute(_answers=answers), [1, 2]
+        )
+
+    def test_passing_answers_arguments(self):
+        def grade(answers):
+            """Grade"""
+            return answers
+
+        # Options may take answers of their own
+        inqex = InqExList("Which one?", [grade])
+        self.assertEqual(
+            inqex.prompt_and_execute(answers=[1, 2], _answers=["Grade"]), [1, 2]
+        )
+
+    def test_answers_from_iterator(self):
+        answers = AnswerProvider(iter(["Return 1", "Return 2"]))
+        self.assertEqual(
+            self.inqex_list.prompt_user(answers=answers).answer, "Return 1"
+        )
+        self.assertEqual(self.inqex_list.prompt_and_execute(_answers=answers), 2)
+        with self.assertRaises(ValueError):
+            self.inqex_list.prompt_user(answers=answers)
+
+    def test_answers_from_json_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "answers.json")
+            with open(path, "w") as f:
+                json.dump(
+                    {"name": "Bruce", "Which one?": "Return 1", "Which ones?": []}, f
+                )
+            answer_dict, execution_stack = self.questions_catalogue.prompt_all(
+                answers=path
+            )
+        self.assertDictEqual(answer_dict, {"name": "Bruce"})
+        self.assertListEqual(execution_stack, [self.fs[0]])
+
+    def test_invalid_answers(self):
+        with self.assertRaises(ValueError):
+            self.inqex_list.prompt_user(answers={"Which one?": "Return 3"})
+        with self.assertRaises(ValueError):
+            self.inqex_list.prompt_user(answers={"Something else?": "Return 1"})
+        with self.assertRaises(ValueError):
+            self.inqex_checkbox.prompt_user(answers={"Which ones?": "Return 1"})
+        with self.assertRaises(ValueError):
+            self.inqex_checkbox.prompt_user(answers={"Which ones?": ["Return 3"]})
+
+
+class TestBackends(unittest.TestCase):
+    def setUp(self):
+        def return_one():
+            """Return 1"""
+            return 1
+
+        def return_two():
+            """Return 2"""
+            return 2
+
+        def return_three():
+            """Return 3"""
+            return 3
+
+        self.fs = [return_one, return_two, return_three]
+
+    def use_backend(self, backend):
+        self.addCleanup(set_backend, set_backend(backend))
+
+    def prompt_with_keys(self, inqex, keys, height=10):
+        stream = io.StringIO()
+        backend = AnsiBackend(height=height, stream=stream, readkey=iter(keys).__next__)
+        self.use_backend(backend)
+        return inqex.prompt_user().answer, stream.getvalue()
+
+    def test_setting_backends(self):
+        with self.assertRaises(TypeError):
+            set_backend("ansi")
+        # Backends that can't prompt can't be created
+        class IncompleteBackend(PromptBackend):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteBackend()
+        backend = FakeBackend(["Return 2"])
+        self.use_backend(backend)
+        self.assertIs(set_backend(backend), backend)
+        inqex = InqExList("Which one?", self.fs)
+        with patch("inquirer_executor.inquirer_executor.prompt") as fake_prompt:
+            self.assertEqual(inqex.prompt_and_execute(), 2)
+        fake_prompt.assert_not_called()
+        self.assertEqual(
+            backend.prompted, [("Which one?", ["Return 1", "Return 2", "Return 3"])]
+        )
+
+    def test_passing_answers(self):
+        # Passed answers always take precedence
+        backend = FakeBackend([])
+        self.use_backend(backend)
+        inqex = InqExList("Which one?", self.fs)
+        self.assertEqual(inqex.prompt_and_execute(_answers=["Return 3"]), 3)
+        self.assertEqual(backend.prompted, [])
+
+    def test_catalogue(self):
+        backend = FakeBackend(
+            {"name": "Ada", "Which one?": "Return 1", "Which ones?": ["Return 3"]}
+        )
+        self.use_backend(backend)
+        questions_catalogue = QuestionsCatalogue(
+            [
+                Text("name", message="What's your name?"),
+                InqExList("Which one?", self.fs),
+                InqExCheckbox("Which ones?", self.fs),
+            ]
+        )
+        answer_dict, execution_stack = questions_catalogue.prompt_all()
+        self.assertEqual(answer_dict, {"name": "Ada"})
+        self.assertEqual(execution_stack, [self.fs[0], self.fs[2]])
+        self.assertEqual(
+            [message for message, _ in backend.prompted],
+            ["name", "Which one?", "Which ones?"],
+        )
+
+    def test_ansi_list(self):
+        inqex = InqExList("Which one?", self.fs)
+        answer, output = self.prompt_with_keys(
+            inqex, [key.DOWN, key.DOWN, key.DOWN, key.UP, key.ENTER]
+        )
+        self.assertEqual(answer, "Return 2")
+        self.assertIn("Which one?: Return 2", output)
+
+        inqex.carousel = True
+        answer, _ = self.prompt_with_keys(inqex, [key.UP, key.ENTER])
+        self.assertEqual(answer, "Return 3")
+
+    def test_ansi_checkbox(self):
+        inqex = InqExCheckbox("Which ones?", self.fs)
+        answer, _ = self.prompt_with_keys(
+            inqex,
+            [key.DOWN, key.DOWN, key.SPACE, key.UP, key.UP, key.SPACE]
+            + [key.DOWN, key.SPACE, key.SPACE, key.ENTER],
+        )
+        # In the order of the options, not of selection
+        self.assertEqual(answer, ["Return 1", "Return 3"])
+
+    def test_ansi_filtering(self):
+        inqex = InqExList("Which one?", self.fs, filterable=True)
+        answer, _ = self.prompt_with_keys(
+            inqex, ["n", " ", "2", "x", key.ENTER, key.BACKSPACE, key.ENTER]
+        )
+        self.assertEqual(answer, "Return 2")
+
+    def test_ansi_rendering_window(self):
+        inqex = InqExList("Which one?", benchmark.make_functions(100000))
+        answer, output = self.prompt_with_keys(
+            inqex, [key.PAGE_DOWN, key.DOWN, key.ENTER], height=5
+        )
+        self.assertEqual(answer, "Return 6")
+        # Only the options around the cursor are rendered
+        self.assertNotIn("Return 12", output)
+        self.assertLess(len(output), 1000)
+
+    def test_ansi_interrupting(self):
+        inqex = InqExList("Which one?", self.fs)
+        with self.assertRaises(KeyboardInterrupt):
+            self.prompt_with_keys(inqex, [key.DOWN, key.CTRL_C])
+
+
+class TestSessionRecording(unittest.TestCase):
+    def setUp(self):
+        def return_one():
+            """Return 1"""
+            return 1
+
+        def return_two():
+            """Return 2"""
+            return 2
+
+        self.fs = [return_one, return_two]
+        self.inqex_list = InqExList("Which one?", self.fs)
+        self.questions_catalogue = QuestionsCatalogue(
+            [
+                Text("name", message="What's your name"),
+                InqExCheckbox("Which ones?", self.fs),
+            ]
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "session.jsonl")
+
+    def fake_prompt(self, questions, **kwargs):
+        if isinstance(questions[0], List):
+            return {"omittet": "Return 2"}
+        if isinstance(questions[0], Checkbox):
+            return {"omittet": ["Return 1"]}
+        return {"name": "Bruce"}
+
+    def test_recording_and_replaying(self):
+        with patch("inquirer_executor.inquirer_executor.prompt", self.fake_prompt):
+            with SessionRecorder(self.path):
+                self.assertEqual(self.inqex_list.prompt_and_execute(), 2)
+                recorded = self.questions_catalogue.prompt_all()
+
+        with open(self.path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertListEqual(
+            [(record["question"], record["answer"]) for record in records],
+            [
+                ("Which one?", "Return 2"),
+                ("name", "Bruce"),
+                ("Which ones?", ["Return 1"]),
+            ],
+        )
+        self.assertTrue(records[0]["functions"][0].endswith("return_two"))
+        self.assertLessEqual(records[0]["started"], records[0]["finished"])
+
+        self.questions_catalogue.execution_stack = []
+        with patch(
+            "inquirer_executor.inquirer_executor.prompt",
+            side_effect=AssertionError("The user got prompted."),
+        ):
+            with SessionReplayer(self.path):
+                self.assertEqual(self.inqex_list.prompt_and_execute(), 2)
+                self.assertEqual(self.questions_catalogue.prompt_all(), recorded)
+            # Outside of the context manager it can be passed in as answers
+            self.assertEqual(
+                self.inqex_list.prompt_and_execute(_answers=SessionReplayer(self.path)),
+                2,
+            )
+
+    def test_replaying_a_different_session(self):
+        with patch("inquirer_executor.inquirer_executor.prompt", self.fake_prompt):
+            with SessionRecorder(self.path):
+                self.questions_catalogue.prompt_all()
+        with SessionReplayer(self.path):
+            with self.assertRaises(ValueError):
+                self.inqex_list.prompt_user()
+
+
+class TestObservers(unittest.TestCase):
+    def setUp(self):
+        def return_one():
+            """Return 1"""
+            return 1
+
+        def fail():
+            """Fail"""
+            raise RuntimeError("failed")
+
+        self.fs = [return_one, fail]
+        self.inqex_list = InqExList("Which one?", self.fs)
+        self.inqex_checkbox = InqExCheckbox("Which ones?", self.fs)
+        self.events = []
+
+    def test_observing_list(self):
+        self.inqex_list.add_observer(self.events.append)
+        with patch(
+            "inquirer_executor.inquirer_executor.prompt",
+            return_value={"omittet": "Return 1"},
+        ):
+            self.assertEqual(self.inqex_list.prompt_and_execute(), 1)
+        self.assertListEqual(
+            [event.kind for event in self.events],
+            [
+                "prompt_start",
+                "question_build",
+                "prompt_end",
+                "answer_resolved",
+                "execution_start",
+                "execution_end",
+            ],
+        )
+        self.assertTrue(all(event.source is self.inqex_list for event in self.events))
+        self.assertIs(self.events[-1].option, self.fs[0])
+        timestamps = [event.timestamp for event in self.events]
+        self.assertListEqual(timestamps, sorted(timestamps))
+
+        self.events.clear()
+        self.inqex_list.answer = "Fail"
+        with self.assertRaises(RuntimeError):
+            self.inqex_list.execute()
+        self.assertIsInstance(self.events[-1].exception, RuntimeError)
+
+        self.inqex_list.remove_observer(self.events.append)
+        self.events.clear()
+        self.inqex_list.answer = "Return 1"
+        self.inqex_list.execute()
+        self.assertListEqual(self.events, [])
+
+    def test_observing_catalogue(self):
+        questions_catalogue = QuestionsCatalogue(
+            [Text("name", message="What's your name"), self.inqex_checkbox]
+        )
+        questions_catalogue.add_observer(self.events.append)
+        questions_catalogue.prompt_all(
+            answers={"name": "Bruce", "Which ones?": ["Return 1"]}
+        )
+        self.assertListEqual(
+            [(event.kind, event.option) for event in self.events],
+            [
+                ("prompt_start", ("name",)),
+                ("prompt_end", ("name",)),
+                ("prompt_start", None),
+                ("prompt_end", None),
+                ("answer_resolved", [self.fs[0]]),
+            ],
+        )
+        # Outside of prompt_all, its questions are not observed anymore
+        self.inqex_checkbox.find_functions()
+        self.assertEqual(len(self.events), 5)
+
+    def test_observing_catalogue_only_in_its_thread(self):
+        other = InqExList("Which other one?", self.fs)
+
+        def prompt_other():
+            other.prompt_user(answers=["Return 1"]).find_function()
+
+        def observe(event):
+            self.events.append(event)
+            if event.kind == "prompt_start" and event.source is self.inqex_list:
+                # Questions prompted elsewhere in the meantime aren't observed
+                thread = threading.Thread(target=prompt_other)
+                thread.start()
+                thread.join()
+
+        questions_catalogue = QuestionsCatalogue([self.inqex_list])
+        questions_catalogue.add_observer(observe)
+        questions_catalogue.prompt_all(answers=["Return 1"])
+        self.assertEqual(other.answer, "Return 1")
+        self.assertTrue(self.events)
+        self.assertFalse([event for event in self.events if event.source is other])
+
+    def test_observing_between_iterations(self):
+        other = InqExList("Which other one?", self.fs)
+        questions_catalogue = QuestionsCatalogue([self.inqex_list, self.inqex_checkbox])
+        questions_catalogue.add_observer(self.events.append)
+        iterator = questions_catalogue.iter_prompt(answers=["Return 1", ["Fail"]])
+        self.assertEqual(next(iterator), (self.inqex_list, self.fs[0]))
+        other.prompt_user(answers=["Return 1"]).find_function()
+        self.assertEqual(next(iterator), (self.inqex_checkbox, [self.fs[1]]))
+        self.assertTrue(self.events)
+        self.assertFalse([event for event in self.events if event.source is other])
+
+    def test_observing_snapshots(self):
+        self.inqex_checkbox.add_observer(self.events.append)
+        self.inqex_checkbox.answer = ["Return 1"]
+        self.inqex_checkbox.find_functions()
+        self.assertListEqual(self.events[-1].option, [self.fs[0]])
+        self.assertIsNot(self.events[-1].option, self.inqex_checkbox.execution_stack)
+
+    def test_latency_histogram(self):
+        histogram = LatencyHistogram(bounds=[10, 0.000001])
+        add_observer(histogram)
+        self.addCleanup(remove_observer, histogram)
+        self.inqex_checkbox.prompt_user(answers={"Which ones?": ["Return 1", "Fail"]})
+        self.inqex_checkbox.find_functions()
+        with self.assertRaises(RuntimeError):
+            self.inqex_checkbox.execute()
+
+        summary = histogram.summary()
+        self.assertEqual(summary["prompt"]["count"], 1)
+        self.assertEqual(summary["execution"]["count"], 2)
+        self.assertEqual(summary["execution"]["buckets"][">10"], 0)
+        self.assertEqual(sum(summary["execution"]["buckets"].values()), 2)
+        name = "execution {}.{}".format(__name__, self.fs[0].__qualname__)
+        self.assertEqual(summary[name]["count"], 1)
+
+    def test_observing_queued_functions(self):
+        finished = threading.Event()
+
+        def wait():
+            """Wait"""
+            time.sleep(0.05)
+            finished.set()
+
+        def check():
+            """Check"""
+            return finished.is_set()
+
+        # With a single worker, the second function waits for the first
+        inqex = InqExCheckbox(
+            "Which ones?", [wait, check], executor="thread", max_workers=1
+        )
+        inqex.add_observer(self.events.append)
+        inqex.answer = ["Wait", "Check"]
+        inqex.find_functions()
+        self.assertListEqual(inqex.execute(), [None, True])
+        # Waiting for a worker doesn't count as executing
+        starts = [
+            event.timestamp for event in self.events if event.kind == "execution_start"
+        ]
+        ends = [
+            event.timestamp for event in self.events if event.kind == "execution_end"
+        ]
+        self.assertGreaterEqual(starts[1], ends[0])
+
+    def test_jsonl_event_writer(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.jsonl")
+            with JsonlEventWriter(path) as writer:
+                self.inqex_list.add_observer(writer)
+                self.inqex_list.prompt_and_execute(_answers={"Which one?": "Return 1"})
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records[-1]["kind"], "execution_end")
+        self.assertEqual(records[-1]["message"], "Which one?")
+        self.assertTrue(records[-1]["option"].endswith("return_one"))
+        self.assertIsNone(records[-1]["exception"])
+
 
 class TestDocstringDecorator(unittest.TestCase):
     def test_decorator(self):
@@ -351,3 +2321,146 @@ class TestDocstringDecorator(unittest.TestCase):
         self.assertEqual(some_function.__name__, "some_function")
         self.assertEqual(some_function.__doc__, "Overwritten docstring")
         self.assertTrue(some_function())
+
+    def test_no_wrapper(self):
+        def some_function():
+            """Some docstring."""
+            return True
+
+        # The decorated function is a copy running the same code
+        decorated = dynamic_docstring_decorator("Docstring")(some_function)
+        self.assertIsNot(decorated, some_function)
+        self.assertIs(decorated.__code__, some_function.__code__)
+        self.assertEqual(some_function.__doc__, "Some docstring.")
+        self.assertTrue(decorated())
+
+        method = dynamic_docstring_decorator("Docstring")(self.id)
+        self.assertEqual(method.__doc__, "Docstring")
+        self.assertIs(method.__self__, self)
+        self.assertEqual(method(), self.id())
+        self.assertNotEqual(type(self).id.__doc__, "Docstring")
+
+    def test_keeping_annotations(self):
+        def add_one(number: int) -> int:
+            return number + 1
+
+        decorated = dynamic_docstring_decorator("Add one")(add_one)
+        self.assertDictEqual(decorated.__annotations__, {"number": int, "return": int})
+        self.assertIsNot(decorated.__annotations__, add_one.__annotations__)
+        self.assertIs(decorated.__wrapped__, add_one)
+        self.assertEqual(decorated.__doc__, "Add one")
+        self.assertEqual(decorated(1), 2)
+
+    def test_decorating_a_function_twice(self):
+        def greet(name):
+            return "Hello " + name
+
+        greetings = [
+            dynamic_docstring_decorator("Greet {}".format(name))(greet)
+            for name in ("Ann", "Bob")
+        ]
+        greetings += [
+            dynamic_docstring_decorator("Hi {}", name)(greet) for name in ("Ann", "Bob")
+        ]
+        inqex = InqExList("Whom?", greetings)
+        self.assertEqual(
+            inqex._choices(), ("Greet Ann", "Greet Bob", "Hi Ann", "Hi Bob")
+        )
+        self.assertEqual(len(set(map(id, greetings))), 4)
+        self.assertIsNone(greet.__doc__)
+        inqex.answer = "Hi Bob"
+        self.assertEqual(inqex.execute("Bob"), "Hello Bob")
+
+    def test_lazy_docstrings(self):
+        rendered = []
+
+        def render(first_name, last_name):
+            rendered.append(last_name)
+            return "{} {}".format(first_name, last_name)
+
+        @dynamic_docstring_decorator(render, "Ada", last_name="Lovelace")
+        def show():
+            """Some docstring."""
+
+        @dynamic_docstring_decorator("Delete {} {}", "Ada", "Lovelace")
+        def delete():
+            pass
+
+        # Nothing is rendered until the options are displayed
+        inqex = InqExList("Which one?", [show, delete])
+        self.assertEqual(rendered, [])
+        self.assertEqual(show.__doc__, "Some docstring.")
+
+        self.assertEqual(
+            inqex._question[0].choices, ["Ada Lovelace", "Delete Ada Lovelace"]
+        )
+        self.assertEqual(show.__doc__, "Ada Lovelace")
+        self.assertEqual(delete.__doc__, "Delete Ada Lovelace")
+
+        # ... and then only once
+        InqExCheckbox("Which ones?", [delete, show])._question
+        self.assertEqual(rendered, ["Lovelace"])
+
+        inqex.answer = "Delete Ada Lovelace"
+        self.assertIs(inqex.find_function(), delete)
+
+    def test_lazy_docstrings_of_methods(self):
+        class Contact:
+            def __init__(self, name):
+                self.name = name
+
+                @dynamic_docstring_decorator("Call {}", name)
+                def call():
+                    return name
+
+                self.call = call
+
+            @dynamic_docstring_decorator(str.upper, "say hello")
+            def greet(self):
+                return "Hello"
+
+        contact = Contact("Ada")
+        inqex = InqExList("Which one?", [contact.call, contact.greet])
+        self.assertEqual(inqex._choices(), ("Call Ada", "SAY HELLO"))
+        self.assertEqual(Contact.greet.__doc__, "SAY HELLO")
+
+
+class TestImporting(unittest.TestCase):
+    def test_deferring_imports(self):
+        code = (
+            "import sys, inquirer_executor\n"
+            "print(sorted({'inquirer', 'asyncio', 'concurrent.futures'} & set(sys.modules)))"
+        )
+        directory = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=directory,
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        ).stdout
+        self.assertEqual(output.strip(), "[]")
+
+    def test_checking_question_types(self):
+        # Questions of the inquirer package are accepted as long as
+        # it is imported, which it has to be to create them
+        questions_catalogue = QuestionsCatalogue([Text("name", message="Name?")])
+        self.assertEqual(len(questions_catalogue), 1)
+        with patch.dict(sys.modules, {"inquirer": None}):
+            with self.assertRaises(TypeError):
+                QuestionsCatalogue(["not a question"])
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_running_benchmarks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            with redirect_stdout(io.StringIO()):
+                benchmark.main(
+                    ["--sizes", "1", "10", "--repeat", "1", "--output", path]
+                )
+            with open(path) as f:
+                report = json.load(f)
+        self.assertEqual(len(report["results"]), 2 * len(benchmark.BENCHMARKS))
+        for result in report["results"]:
+            self.assertGreater(result["best"], 0)